@@ -0,0 +1,224 @@
+"""
+Benchmark do NotificationDispatcher contra um webhook local
+
+Sobe um servidor aiohttp que imita a Bot API do Telegram e um webhook do
+Discord (com os limites de taxa de cada provedor, respondendo 429 quando
+excedidos) e dispara rajadas de alertas como o loop de detecção faria.
+Mede o custo de `notify()` no loop, mensagens enviadas, alertas agrupados e
+descartados, respostas 429 e a maior taxa de envio observada.
+
+Uso:
+    python benchmarks/bench_notifications.py --alerts-per-second 500 --duration 20
+"""
+
+import argparse
+import asyncio
+import platform
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'src'))
+
+from aiohttp import web
+from prometheus_client import CollectorRegistry
+
+from monitoring.metrics import MetricsCollector
+from monitoring.notifications import DiscordChannel, NotificationDispatcher, TelegramChannel, TokenBucket
+
+from bench_pipeline import git_commit, save_report
+from synthetic_market import percentile
+
+
+class WebhookStandIn:
+    """Servidor local no formato da Bot API do Telegram e de webhooks do Discord"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.port = None
+        self.received = defaultdict(list)
+        self.rejected = defaultdict(int)
+        self._limits = {
+            'telegram': TokenBucket(TelegramChannel.rate, TelegramChannel.burst),
+            'discord': TokenBucket(DiscordChannel.rate, DiscordChannel.burst),
+        }
+        self._runner = None
+        self.app = web.Application()
+        self.app.router.add_post('/bot{token}/sendMessage', self.handle_telegram)
+        self.app.router.add_post('/api/webhooks/{id}/{token}', self.handle_discord)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def _accept(self, channel: str, text: str) -> float:
+        """Retorna 0 se aceito ou os segundos até o próximo envio permitido"""
+        bucket = self._limits[channel]
+        delay = bucket.delay()
+        if delay > 0:
+            self.rejected[channel] += 1
+            return delay
+        bucket.consume()
+        self.received[channel].append((time.monotonic(), len(text)))
+        return 0.0
+
+    async def handle_telegram(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        await asyncio.sleep(self.latency)
+        retry_after = self._accept('telegram', data['text'])
+        if retry_after:
+            return web.json_response({'ok': False, 'error_code': 429,
+                                      'parameters': {'retry_after': max(1, round(retry_after))}}, status=429)
+        return web.json_response({'ok': True, 'result': {}})
+
+    async def handle_discord(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        await asyncio.sleep(self.latency)
+        retry_after = self._accept('discord', data['content'])
+        if retry_after:
+            return web.json_response({'message': 'You are being rate limited.',
+                                      'retry_after': retry_after, 'global': False}, status=429)
+        return web.Response(status=204)
+
+    def max_per_second(self, channel: str) -> int:
+        window, best = deque(), 0
+        for at, _ in self.received[channel]:
+            window.append(at)
+            while window[0] <= at - 1.0:
+                window.popleft()
+            best = max(best, len(window))
+        return best
+
+
+async def run(args) -> dict:
+    standin = WebhookStandIn(latency=args.latency)
+    await standin.start()
+    base = f"http://127.0.0.1:{standin.port}"
+
+    registry = CollectorRegistry()
+    dispatcher = NotificationDispatcher(
+        [TelegramChannel('bench-token', '1', api_url=base), DiscordChannel(f"{base}/api/webhooks/1/bench")],
+        max_queue=args.queue_size,
+        digest_window=args.digest_seconds,
+        metrics=MetricsCollector(registry=registry)
+    )
+    await dispatcher.start()
+
+    rng = random.Random(args.seed)
+    routes = [(f"SYN{i}/USDT", 'binance', 'kraken') for i in range(args.routes)]
+    notify_ns = []
+    offered = 0
+    interval = 1.0 / args.alerts_per_second
+
+    start = time.perf_counter()
+    next_alert = start
+    while time.perf_counter() - start < args.duration:
+        symbol, buy, sell = rng.choice(routes)
+        opportunity = {'symbol': symbol, 'buy_exchange': buy, 'sell_exchange': sell,
+                       'buy_price': 100.0, 'sell_price': 100.5, 'profit_percent': rng.uniform(0.3, 1.0)}
+        t0 = time.perf_counter_ns()
+        if rng.random() < args.trade_ratio:
+            dispatcher.notify_trade(opportunity, 0.5, 10000.0)
+        else:
+            dispatcher.notify_opportunity(opportunity)
+        notify_ns.append(time.perf_counter_ns() - t0)
+        offered += 1
+
+        next_alert += interval
+        await asyncio.sleep(max(0.0, next_alert - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+
+    await dispatcher.stop(flush_timeout=args.flush_timeout)
+    await standin.stop()
+
+    channels = {}
+    for outbox in dispatcher.outboxes:
+        name = outbox.channel.name
+        latency_sum = registry.get_sample_value('arbitragex_notification_send_latency_seconds_sum', {'channel': name})
+        latency_count = registry.get_sample_value('arbitragex_notification_send_latency_seconds_count', {'channel': name})
+        channels[name] = {
+            'messages_sent': outbox.sent,
+            'alerts_coalesced': outbox.coalesced,
+            'alerts_dropped': int(registry.get_sample_value(
+                'arbitragex_notification_alerts_total', {'channel': name, 'outcome': 'dropped'}) or 0),
+            'alerts_left_pending': sum(item[1] for item in outbox.pending.values()),
+            'rate_limited': outbox.rate_limited,
+            'failed': outbox.failed,
+            'send_latency_mean_ms': (latency_sum / latency_count * 1000) if latency_count else 0.0,
+            'max_messages_per_second': standin.max_per_second(name),
+            'max_message_length': max((n for _, n in standin.received[name]), default=0),
+        }
+
+    return {
+        'benchmark': 'notifications',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'alerts_per_second': args.alerts_per_second,
+            'duration': args.duration,
+            'routes': args.routes,
+            'trade_ratio': args.trade_ratio,
+            'digest_seconds': args.digest_seconds,
+            'queue_size': args.queue_size,
+            'latency': args.latency,
+            'seed': args.seed,
+        },
+        'results': {
+            'elapsed_seconds': elapsed,
+            'alerts_offered': offered,
+            'notify_p50_us': percentile(notify_ns, 50) / 1000,
+            'notify_p99_us': percentile(notify_ns, 99) / 1000,
+            'notify_max_us': max(notify_ns, default=0) / 1000,
+            'channels': channels,
+        },
+    }
+
+
+def print_report(report: dict):
+    results = report['results']
+    print(f"🔔 Notificações: {results['alerts_offered']} alertas em {results['elapsed_seconds']:.1f}s ({report['commit']})")
+    print(f"   ⏱️  notify(): p50={results['notify_p50_us']:.1f}µs p99={results['notify_p99_us']:.1f}µs "
+          f"max={results['notify_max_us']:.1f}µs")
+    for name, channel in results['channels'].items():
+        print(f"   📨 {name}: {channel['messages_sent']} mensagens, {channel['alerts_coalesced']} agrupados, "
+              f"{channel['alerts_dropped']} descartados, {channel['rate_limited']}x 429, {channel['failed']} falhas, "
+              f"máx {channel['max_messages_per_second']}/s, envio médio {channel['send_latency_mean_ms']:.1f}ms")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do dispatcher de notificações com webhook local')
+    parser.add_argument('--alerts-per-second', type=float, default=200)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--routes', type=int, default=100, help='Rotas distintas (chaves de agrupamento)')
+    parser.add_argument('--trade-ratio', type=float, default=0.2, help='Fração de alertas de trade (não agrupáveis)')
+    parser.add_argument('--digest-seconds', type=float, default=5)
+    parser.add_argument('--queue-size', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05, help='Latência simulada do provedor (s)')
+    parser.add_argument('--flush-timeout', type=float, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Arquivo JSON de saída (padrão: benchmarks/results/)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+    print(f"💾 Resultado salvo em {save_report(report, args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""
+Benchmark ponta a ponta do pipeline do ArbitrageX
+
+Alimenta o RealMarketAnalyzer real (parsing das respostas das exchanges),
+a detecção e a execução simulada do ArbitrageBot com um mercado sintético
+local, sem rede nem banco. Mede ticks/s sustentados, latência tick→decisão
+(p50/p99) e memória, e grava o resultado em JSON em benchmarks/results.
+
+Uso:
+    python benchmarks/bench_pipeline.py --symbols 50 --venues 3 --rate 10 --duration 30
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<baseline>.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'src'))
+
+from prometheus_client import CollectorRegistry
+
+import bot.arbitrage_bot as arbitrage_bot_module
+from bot.arbitrage_bot import ArbitrageBot
+from monitoring.metrics import MetricsCollector
+from utils.config import Config
+
+from synthetic_market import VENUES, SyntheticMarket, SyntheticSession, percentile
+
+RESULTS_DIR = BENCH_DIR / 'results'
+
+# métricas comparadas com --compare e se "maior é melhor"
+COMPARED_METRICS = {
+    'ticks_per_second': True,
+    'cycles_per_second': True,
+    'tick_to_decision_p50_ms': False,
+    'tick_to_decision_p99_ms': False,
+    'tick_to_trade_p99_ms': False,
+    'rss_peak_mb': False,
+}
+
+
+class _NoSleepAsyncio:
+    """
+    Módulo asyncio do bot sem as pausas artificiais (0.1s entre símbolos,
+    0.2s na simulação, 0.1s na execução), para medir só o custo de CPU.
+    """
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    @staticmethod
+    def sleep(delay, result=None):
+        return asyncio.sleep(0, result)
+
+
+def _rss_mb() -> float:
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class PipelineBenchmark:
+    """Executa ciclos de detecção/execução do bot contra o mercado sintético"""
+
+    def __init__(self, args):
+        self.args = args
+        venues = VENUES[:args.venues]
+        self.market = SyntheticMarket(args.symbols, venues=venues, seed=args.seed,
+                                      jump_probability=args.jump_probability)
+
+        config = Config(trading_symbols=list(self.market.symbols), signal_mode=args.signal_mode)
+        self.bot = ArbitrageBot(config, metrics=MetricsCollector(registry=CollectorRegistry()))
+        logging.getLogger().setLevel(args.log_level)
+
+        analyzer = self.bot.market_analyzer
+        for exchange, symbols_map in self.market.symbol_maps().items():
+            analyzer.api_endpoints[exchange]['symbols_map'].update(symbols_map)
+        analyzer.session = SyntheticSession(self.market)
+        # pares vêm do mercado sintético: sem descoberta nas exchanges reais
+        analyzer.metadata.updated_at = time.time()
+        self._fetch_all_prices = analyzer.fetch_all_prices
+        analyzer.fetch_all_prices = self._timed_fetch_all_prices
+        self._execute = self.bot.execute_arbitrage_trade
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.market.symbols)}
+
+        self.recording = False
+        self.ticks = 0
+        self.cycles = 0
+        self.opportunities = 0
+        self.trades = 0
+        self.decision_latencies = []
+        self.trade_latencies = []
+        self._pending = None
+        self._generated_at = {}
+
+    def _close_pending(self):
+        if self._pending is not None and self.recording:
+            self.decision_latencies.append(time.perf_counter() - self._pending)
+        self._pending = None
+
+    async def _timed_fetch_all_prices(self, symbol):
+        # a decisão sobre o símbolo anterior termina quando o bot passa ao próximo
+        self._close_pending()
+        index = self._symbol_index[symbol]
+        if self.args.rate <= 0:
+            self.market.step()
+        generated_at = float(self.market.generated_at[index])
+        prices = await self._fetch_all_prices(symbol)
+        self._pending = generated_at
+        self._generated_at[symbol] = generated_at
+        if self.recording:
+            self.ticks += len(prices)
+        return prices
+
+    async def _drive_market(self):
+        """Gerar ticks na taxa configurada (por símbolo/exchange)"""
+        interval = 1.0 / self.args.rate
+        next_tick = time.perf_counter()
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+            self.market.step()
+
+    async def _cycle(self):
+        opportunities = await self.bot.find_arbitrage_opportunities()
+        self._close_pending()
+        for opportunity in opportunities:
+            if await self._execute(opportunity) and self.recording:
+                self.trades += 1
+                self.trade_latencies.append(time.perf_counter() - self._generated_at[opportunity['symbol']])
+        if self.recording:
+            self.cycles += 1
+            self.opportunities += len(opportunities)
+
+    async def run(self) -> dict:
+        original_asyncio = arbitrage_bot_module.asyncio
+        arbitrage_bot_module.asyncio = _NoSleepAsyncio()
+        driver = asyncio.create_task(self._drive_market()) if self.args.rate > 0 else None
+        try:
+            for _ in range(self.args.warmup_cycles):
+                await self._cycle()
+
+            rss_start = _rss_mb()
+            self.recording = True
+            start = time.perf_counter()
+            end = start + self.args.duration
+            while time.perf_counter() < end:
+                await self._cycle()
+            elapsed = time.perf_counter() - start
+            self.recording = False
+        finally:
+            arbitrage_bot_module.asyncio = original_asyncio
+            if driver:
+                driver.cancel()
+                try:
+                    await driver
+                except asyncio.CancelledError:
+                    pass
+
+        return self._report(elapsed, rss_start)
+
+    def _report(self, elapsed: float, rss_start: float) -> dict:
+        ms = 1000.0
+        return {
+            'benchmark': 'pipeline',
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {
+                'symbols': self.args.symbols,
+                'venues': self.args.venues,
+                'rate': self.args.rate,
+                'duration': self.args.duration,
+                'signal_mode': self.args.signal_mode,
+                'jump_probability': self.args.jump_probability,
+                'seed': self.args.seed,
+            },
+            'results': {
+                'elapsed_seconds': elapsed,
+                'cycles': self.cycles,
+                'ticks': self.ticks,
+                'ticks_per_second': self.ticks / elapsed,
+                'cycles_per_second': self.cycles / elapsed,
+                'offered_ticks_per_second': self.args.rate * self.args.symbols * self.args.venues,
+                'opportunities': self.opportunities,
+                'trades': self.trades,
+                'tick_to_decision_p50_ms': percentile(self.decision_latencies, 50) * ms,
+                'tick_to_decision_p99_ms': percentile(self.decision_latencies, 99) * ms,
+                'tick_to_decision_max_ms': max(self.decision_latencies, default=0.0) * ms,
+                'tick_to_trade_p50_ms': percentile(self.trade_latencies, 50) * ms,
+                'tick_to_trade_p99_ms': percentile(self.trade_latencies, 99) * ms,
+                'rss_start_mb': rss_start,
+                'rss_peak_mb': _rss_mb(),
+            },
+        }
+
+
+def print_report(report: dict):
+    params, results = report['params'], report['results']
+    print(f"📊 Pipeline: {params['symbols']} símbolos x {params['venues']} exchanges, "
+          f"rate={params['rate']}/s, {results['elapsed_seconds']:.1f}s ({report['commit']})")
+    print(f"   🔁 Ciclos: {results['cycles']} ({results['cycles_per_second']:.1f}/s)")
+    print(f"   📈 Ticks: {results['ticks']} ({results['ticks_per_second']:.0f}/s)")
+    print(f"   ⏱️  Tick→decisão: p50={results['tick_to_decision_p50_ms']:.3f}ms "
+          f"p99={results['tick_to_decision_p99_ms']:.3f}ms max={results['tick_to_decision_max_ms']:.3f}ms")
+    print(f"   🚀 Tick→trade: p50={results['tick_to_trade_p50_ms']:.3f}ms p99={results['tick_to_trade_p99_ms']:.3f}ms")
+    print(f"   🎯 Oportunidades: {results['opportunities']}  Trades: {results['trades']}")
+    print(f"   💾 RSS: {results['rss_start_mb']:.1f}MB → pico {results['rss_peak_mb']:.1f}MB")
+
+
+def compare(report: dict, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())
+    if baseline.get('params') != report['params']:
+        print(f"⚠️  Parâmetros diferentes do baseline: {baseline.get('params')}")
+    print(f"🆚 Comparação com {baseline_path} ({baseline.get('commit')})")
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        before = baseline['results'].get(metric)
+        after = report['results'][metric]
+        if not before:
+            continue
+        change = (after - before) / before * 100
+        improved = change > 0 if higher_is_better else change < 0
+        marker = '✅' if improved else '❌' if abs(change) >= 1 else '➖'
+        print(f"   {marker} {metric}: {before:.3f} → {after:.3f} ({change:+.1f}%)")
+
+
+def save_report(report: dict, output: str = None) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        path = RESULTS_DIR / f"{report['benchmark']}-{stamp}-{report['commit']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline do ArbitrageX com mercado sintético')
+    parser.add_argument('--symbols', type=int, default=50, help='Número de símbolos sintéticos')
+    parser.add_argument('--venues', type=int, default=3, choices=range(2, len(VENUES) + 1),
+                        help='Número de exchanges (máx. 3)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Ticks/s por símbolo e exchange (0 = cotação nova a cada requisição)')
+    parser.add_argument('--duration', type=float, default=10, help='Duração medida em segundos')
+    parser.add_argument('--warmup-cycles', type=int, default=1, help='Ciclos descartados antes da medição')
+    parser.add_argument('--signal-mode', choices=['threshold', 'zscore'], default='threshold')
+    parser.add_argument('--jump-probability', type=float, default=0.02,
+                        help='Probabilidade de deslocamento de preço por tick (gera oportunidades)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--log-level', default='WARNING', help='Nível de log do bot durante a medição')
+    parser.add_argument('--output', help='Arquivo JSON de saída (padrão: benchmarks/results/)')
+    parser.add_argument('--compare', help='Resultado JSON anterior para comparação')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(PipelineBenchmark(args).run())
+    print_report(report)
+    print(f"💾 Resultado salvo em {save_report(report, args.output)}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
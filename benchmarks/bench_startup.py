@@ -0,0 +1,248 @@
+"""
+Benchmark de cold start: tempo até a primeira cotação
+
+Sobe um servidor local no formato das APIs de ticker da Binance, Coinbase e
+Kraken (cotações do mercado sintético), grava o cache de metadados de
+exchanges com os pares dele e inicia o ArbitrageX `--runs` vezes em
+processos novos, com os endpoints apontando para esse servidor. Cada processo mede as fases da inicialização e o tempo do
+spawn até a primeira cotação.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 10 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / 'src'
+
+
+async def run_child():
+    """Processo filho: inicializar o app e buscar a primeira cotação"""
+    sys.path.insert(0, str(SRC_DIR))
+    import main as app_main
+
+    # os endpoints vêm do código (o cache só guarda pares): redirecionar para o servidor local
+    base = os.environ['BENCH_EXCHANGE_URL']
+    analyzer_class = app_main.RealMarketAnalyzer
+
+    class StandInAnalyzer(analyzer_class):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            for exchange, endpoints in self.api_endpoints.items():
+                endpoints.update(ExchangeStandIn.endpoints(base, exchange))
+
+    app_main.RealMarketAnalyzer = StandInAnalyzer
+    app = app_main.ArbitrageXApp()
+    if not await app.initialize():
+        raise SystemExit(1)
+    try:
+        symbol = app.config.trading_symbols[0].strip()
+        prices = await app.market_analyzer.fetch_all_prices(symbol)
+        startup = app.startup
+        print(json.dumps({
+            'process_start': app_main.PROCESS_START,
+            'first_quote': startup.started_at + startup.first_quote if startup.first_quote else None,
+            'quotes': len(prices),
+            'phases': startup.phases,
+        }))
+    finally:
+        await app.shutdown()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ExchangeStandIn:
+    """Servidor local com os endpoints de ticker/ping usados pelo RealMarketAnalyzer"""
+
+    def __init__(self, market, latency: float = 0.0):
+        from aiohttp import web
+
+        self.web = web
+        self.market = market
+        self.latency = latency
+        self.port = None
+        self._runner = None
+        self._index = {}
+        for exchange, symbols in market.symbol_maps().items():
+            for i, symbol in enumerate(market.symbols):
+                self._index[(exchange, symbols[symbol])] = i
+        self.app = web.Application()
+        self.app.router.add_get('/binance/ticker', self.handle_binance)
+        self.app.router.add_get('/coinbase/products/{code}/ticker', self.handle_coinbase)
+        self.app.router.add_get('/kraken/ticker', self.handle_kraken)
+        self.app.router.add_get('/{exchange}/ping', self.handle_ping)
+
+    async def start(self):
+        self._runner = self.web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = self.web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _quote(self, exchange: str, code: str):
+        await asyncio.sleep(self.latency)
+        body = self.market.payload(exchange, code, self._index[(exchange, code)])
+        return self.web.Response(body=body, content_type='application/json')
+
+    async def handle_binance(self, request):
+        return await self._quote('binance', request.query['symbol'])
+
+    async def handle_coinbase(self, request):
+        return await self._quote('coinbase', request.match_info['code'])
+
+    async def handle_kraken(self, request):
+        return await self._quote('kraken', request.query['pair'])
+
+    async def handle_ping(self, request):
+        await asyncio.sleep(self.latency)
+        return self.web.json_response({})
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @staticmethod
+    def endpoints(base: str, exchange: str) -> dict:
+        tickers = {
+            'binance': f"{base}/binance/ticker",
+            'coinbase': f"{base}/coinbase/products/{{}}/ticker",
+            'kraken': f"{base}/kraken/ticker",
+        }
+        return {'ticker': tickers[exchange], 'ping': f"{base}/{exchange}/ping"}
+
+    def metadata(self, version: int) -> dict:
+        return {
+            'version': version,
+            'updated_at': time.time(),
+            'venues': {
+                exchange: {'symbols_map': symbols}
+                for exchange, symbols in self.market.symbol_maps().items()
+            },
+        }
+
+
+async def run_parent(args) -> dict:
+    sys.path.insert(0, str(BENCH_DIR))
+    sys.path.insert(0, str(SRC_DIR))
+    from bench_pipeline import git_commit
+    from exchanges.venue_metadata import CACHE_VERSION
+    from synthetic_market import SyntheticMarket
+
+    standin = ExchangeStandIn(SyntheticMarket(args.symbols), latency=args.latency)
+    await standin.start()
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            cache = Path(workdir) / 'venue_metadata.json'
+            cache.write_text(json.dumps(standin.metadata(CACHE_VERSION)))
+            env = dict(
+                os.environ,
+                VENUE_METADATA_CACHE=str(cache),
+                BENCH_EXCHANGE_URL=standin.url,
+                TRADING_SYMBOLS=','.join(standin.market.symbols),
+                POSTGRES_HOST='127.0.0.1',
+                POSTGRES_PORT=str(_free_port()),  # sem banco: conexão recusada na hora
+                QUERY_API_ENABLED='false',
+                TELEGRAM_BOT_TOKEN='',
+                DISCORD_WEBHOOK_URL='',
+                LOG_LEVEL=args.log_level,
+            )
+            for i in range(args.runs):
+                env['PROMETHEUS_PORT'] = str(_free_port())
+                spawned_at = time.monotonic()
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, str(Path(__file__).resolve()), '--child',
+                    cwd=workdir, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await process.communicate()
+                lines = [line for line in stdout.decode().splitlines() if line.startswith('{')]
+                if process.returncode != 0 or not lines:
+                    raise RuntimeError(f"execução {i + 1} falhou (código {process.returncode})")
+                child = json.loads(lines[-1])
+                runs.append({
+                    'time_to_first_quote': child['first_quote'] - spawned_at,
+                    'interpreter': child['process_start'] - spawned_at,
+                    'quotes': child['quotes'],
+                    'phases': child['phases'],
+                })
+    finally:
+        await standin.stop()
+
+    def median(values):
+        return statistics.median(values) if values else 0.0
+
+    phase_names = list(runs[0]['phases']) if runs else []
+    ms = 1000.0
+    return {
+        'benchmark': 'startup',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'runs': args.runs, 'symbols': args.symbols, 'latency': args.latency},
+        'results': {
+            'time_to_first_quote_p50_ms': median([r['time_to_first_quote'] for r in runs]) * ms,
+            'time_to_first_quote_max_ms': max(r['time_to_first_quote'] for r in runs) * ms,
+            'interpreter_p50_ms': median([r['interpreter'] for r in runs]) * ms,
+            'phases_p50_ms': {name: median([r['phases'].get(name, 0.0) for r in runs]) * ms for name in phase_names},
+            'runs': runs,
+        },
+    }
+
+
+def print_report(report: dict):
+    results = report['results']
+    print(f"⚡ Cold start: {report['params']['runs']} execuções ({report['commit']})")
+    print(f"   ⏱️  Tempo até a primeira cotação: p50={results['time_to_first_quote_p50_ms']:.0f}ms "
+          f"max={results['time_to_first_quote_max_ms']:.0f}ms")
+    print(f"   🐍 Interpretador: p50={results['interpreter_p50_ms']:.0f}ms")
+    for name, value in results['phases_p50_ms'].items():
+        print(f"   • {name}: {value:.1f}ms")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de cold start do ArbitrageX (tempo até a primeira cotação)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--symbols', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência simulada por requisição (s)')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', help='Arquivo JSON de saída (padrão: benchmarks/results/)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        asyncio.run(run_child())
+        return
+
+    from bench_pipeline import save_report
+
+    report = asyncio.run(run_parent(args))
+    print_report(report)
+    print(f"💾 Resultado salvo em {save_report(report, args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Gerador sintético de mercado para benchmarks do ArbitrageX
+
+Produz cotações correlacionadas para N símbolos x M exchanges: cada símbolo
+segue um random walk comum e cada exchange desvia dele por um processo de
+Ornstein-Uhlenbeck, com saltos ocasionais que criam oportunidades de
+arbitragem. SyntheticSession imita o `aiohttp.ClientSession` usado pelo
+RealMarketAnalyzer e responde no formato JSON de cada exchange.
+"""
+
+import json
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+VENUES = ('binance', 'coinbase', 'kraken')
+
+
+def venue_symbol(exchange: str, base: str) -> str:
+    """Código do par na exchange, no mesmo padrão de RealMarketAnalyzer.api_endpoints"""
+    if exchange == 'binance':
+        return f"{base}USDT"
+    if exchange == 'coinbase':
+        return f"{base}-USD"
+    return f"{base}USD"
+
+
+class SyntheticMarket:
+    """Cotações correlacionadas por símbolo e exchange"""
+
+    def __init__(self, n_symbols: int, venues: Tuple[str, ...] = VENUES, seed: int = 42,
+                 volatility: float = 0.0005, venue_noise: float = 0.0003, reversion: float = 0.2,
+                 jump_probability: float = 0.02, jump_size: float = 0.006, half_spread: float = 0.0001):
+        self.rng = np.random.default_rng(seed)
+        self.symbols = [f"SYN{i}/USDT" for i in range(n_symbols)]
+        self.venues = venues
+        self.volatility = volatility
+        self.venue_noise = venue_noise
+        self.reversion = reversion
+        self.jump_probability = jump_probability
+        self.jump_size = jump_size
+        self.half_spread = half_spread
+
+        self.base_price = self.rng.uniform(1.0, 50000.0, n_symbols)
+        self.deviation = np.zeros((n_symbols, len(venues)))
+        self.bid = np.zeros((n_symbols, len(venues)))
+        self.ask = np.zeros((n_symbols, len(venues)))
+        self.volume = self.rng.uniform(1e3, 1e6, (n_symbols, len(venues)))
+        self.generated_at = np.zeros(n_symbols)
+        self.ticks = 0
+        self.step()
+
+    def step(self):
+        """Avançar um tick para todos os símbolos e exchanges"""
+        n, m = self.deviation.shape
+        self.base_price *= np.exp(self.volatility * self.rng.standard_normal(n))
+        jumps = (self.rng.random((n, m)) < self.jump_probability) * self.rng.choice((-1.0, 1.0), (n, m))
+        self.deviation += (-self.reversion * self.deviation
+                           + self.venue_noise * self.rng.standard_normal((n, m))
+                           + self.jump_size * jumps)
+        mid = self.base_price[:, None] * (1.0 + self.deviation)
+        self.bid = mid * (1.0 - self.half_spread)
+        self.ask = mid * (1.0 + self.half_spread)
+        self.generated_at[:] = time.perf_counter()
+        self.ticks += n * m
+
+    def symbol_maps(self) -> Dict[str, Dict[str, str]]:
+        """symbols_map por exchange para registrar no RealMarketAnalyzer"""
+        return {
+            exchange: {symbol: venue_symbol(exchange, symbol.split('/')[0]) for symbol in self.symbols}
+            for exchange in self.venues
+        }
+
+    def payload(self, exchange: str, venue_code: str, symbol_index: int) -> bytes:
+        j = self.venues.index(exchange)
+        bid = f"{self.bid[symbol_index, j]:.8f}"
+        ask = f"{self.ask[symbol_index, j]:.8f}"
+        volume = f"{self.volume[symbol_index, j]:.8f}"
+        if exchange == 'binance':
+            data = {'symbol': venue_code, 'bidPrice': bid, 'askPrice': ask, 'volume': volume}
+        elif exchange == 'coinbase':
+            data = {'bid': bid, 'ask': ask, 'volume': volume, 'price': bid}
+        else:
+            data = {'error': [], 'result': {venue_code: {'a': [ask, '1', '1.0'], 'b': [bid, '1', '1.0'],
+                                                         'v': [volume, volume]}}}
+        return json.dumps(data).encode()
+
+
+class _SyntheticResponse:
+    status = 200
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class SyntheticSession:
+    """Substituto local do aiohttp.ClientSession do RealMarketAnalyzer"""
+
+    def __init__(self, market: SyntheticMarket):
+        self.market = market
+        self.requests = 0
+        self._routes: Dict[Tuple[str, str], int] = {}
+        for exchange, symbols in market.symbol_maps().items():
+            for index, symbol in enumerate(market.symbols):
+                self._routes[(exchange, symbols[symbol])] = index
+
+    def get(self, url: str) -> _SyntheticResponse:
+        self.requests += 1
+        parsed = urlparse(url)
+        if 'binance' in parsed.netloc:
+            exchange, code = 'binance', parse_qs(parsed.query)['symbol'][0]
+        elif 'coinbase' in parsed.netloc:
+            exchange, code = 'coinbase', parsed.path.split('/')[2]
+        else:
+            exchange, code = 'kraken', parse_qs(parsed.query)['pair'][0]
+        return _SyntheticResponse(self.market.payload(exchange, code, self._routes[(exchange, code)]))
+
+    async def close(self):
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return float(np.percentile(np.asarray(values), q))
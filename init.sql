@@ -1,9 +1,10 @@
 -- Inicialização do banco de dados para o Crypto Arbitrage Bot
 
--- Tabela para histórico de preços
+-- Tabela para histórico de preços (particionada por dia; partições criadas
+-- e descartadas pelo SchemaManager conforme PRICE_RETENTION_DAYS)
 CREATE TABLE IF NOT EXISTS price_history (
-    id SERIAL PRIMARY KEY,
-    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    id BIGSERIAL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     symbol VARCHAR(20) NOT NULL,
     exchange VARCHAR(50) NOT NULL,
     bid DECIMAL(20, 8),
@@ -11,6 +12,42 @@ CREATE TABLE IF NOT EXISTS price_history (
     last DECIMAL(20, 8),
     volume DECIMAL(20, 8),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+) PARTITION BY RANGE (timestamp);
+
+-- Recebe linhas fora das partições diárias (ex.: manutenção atrasada)
+CREATE TABLE IF NOT EXISTS price_history_default PARTITION OF price_history DEFAULT;
+
+-- Rollups OHLC (preço médio) e spread por exchange, mantidos pelo bot
+CREATE TABLE IF NOT EXISTS price_rollup_1s (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    exchange VARCHAR(50) NOT NULL,
+    open DECIMAL(20, 8) NOT NULL,
+    high DECIMAL(20, 8) NOT NULL,
+    low DECIMAL(20, 8) NOT NULL,
+    close DECIMAL(20, 8) NOT NULL,
+    spread_min DECIMAL(10, 4) NOT NULL,
+    spread_max DECIMAL(10, 4) NOT NULL,
+    spread_sum DECIMAL(20, 8) NOT NULL,
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (symbol, exchange, bucket)
+) PARTITION BY RANGE (bucket);
+
+CREATE TABLE IF NOT EXISTS price_rollup_1s_default PARTITION OF price_rollup_1s DEFAULT;
+
+CREATE TABLE IF NOT EXISTS price_rollup_1m (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    exchange VARCHAR(50) NOT NULL,
+    open DECIMAL(20, 8) NOT NULL,
+    high DECIMAL(20, 8) NOT NULL,
+    low DECIMAL(20, 8) NOT NULL,
+    close DECIMAL(20, 8) NOT NULL,
+    spread_min DECIMAL(10, 4) NOT NULL,
+    spread_max DECIMAL(10, 4) NOT NULL,
+    spread_sum DECIMAL(20, 8) NOT NULL,
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (symbol, exchange, bucket)
 );
 
 -- Tabela para oportunidades de arbitragem
@@ -47,6 +84,30 @@ CREATE TABLE IF NOT EXISTS trades_history (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Estatísticas incrementais de trades (atualizadas pelo bot a cada trade)
+CREATE TABLE IF NOT EXISTS trading_stats_totals (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_trades BIGINT NOT NULL DEFAULT 0,
+    total_profit DECIMAL(20, 8) NOT NULL DEFAULT 0,
+    max_profit DECIMAL(20, 8),
+    min_profit DECIMAL(20, 8),
+    sum_profit_percent DECIMAL(20, 4) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO trading_stats_totals (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS trading_stats_symbols (
+    symbol VARCHAR(20) PRIMARY KEY,
+    trades BIGINT NOT NULL DEFAULT 0,
+    net_profit DECIMAL(20, 8) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS trading_stats_exchanges (
+    exchange VARCHAR(50) PRIMARY KEY,
+    trades BIGINT NOT NULL DEFAULT 0
+);
+
 -- Tabela para configurações do bot
 CREATE TABLE IF NOT EXISTS bot_config (
     id SERIAL PRIMARY KEY,
@@ -60,26 +121,46 @@ CREATE TABLE IF NOT EXISTS bot_config (
 INSERT INTO bot_config (key, value, description) VALUES
 ('min_profit_percent', '0.3', 'Percentual mínimo de lucro para executar trade'),
 ('max_trade_amount', '1000', 'Valor máximo por trade em USDT'),
-('trading_enabled', 'false', 'Se o trading está habilitado'),
+('trading_enabled', 'true', 'Se o trading está habilitado'),
 ('paper_trading', 'true', 'Se está em modo paper trading')
 ON CONFLICT (key) DO NOTHING;
 
+-- Notificar o bot quando bot_config mudar (recarga sem restart)
+CREATE OR REPLACE FUNCTION notify_bot_config_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('bot_config_changed', OLD.key);
+        RETURN OLD;
+    END IF;
+    NEW.updated_at := NOW();
+    PERFORM pg_notify('bot_config_changed', NEW.key);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bot_config_changed ON bot_config;
+CREATE TRIGGER trg_bot_config_changed
+    BEFORE INSERT OR UPDATE OR DELETE ON bot_config
+    FOR EACH ROW EXECUTE FUNCTION notify_bot_config_changed();
+
 -- Índices para performance
-CREATE INDEX IF NOT EXISTS idx_price_history_symbol_timestamp ON price_history(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_price_history_timestamp_brin ON price_history USING BRIN (timestamp);
+CREATE INDEX IF NOT EXISTS idx_price_rollup_1m_bucket_brin ON price_rollup_1m USING BRIN (bucket);
 CREATE INDEX IF NOT EXISTS idx_arbitrage_opportunities_timestamp ON arbitrage_opportunities(timestamp);
 CREATE INDEX IF NOT EXISTS idx_trades_history_timestamp ON trades_history(timestamp);
 CREATE INDEX IF NOT EXISTS idx_trades_history_symbol ON trades_history(symbol);
 
--- View para estatísticas rápidas
-CREATE OR REPLACE VIEW trading_stats AS
-SELECT 
-    COUNT(*) as total_trades,
-    SUM(net_profit) as total_profit,
-    AVG(net_profit) as avg_profit,
-    MAX(net_profit) as max_profit,
-    MIN(net_profit) as min_profit,
-    AVG(profit_percent) as avg_profit_percent,
-    COUNT(DISTINCT symbol) as symbols_traded,
-    COUNT(DISTINCT buy_exchange) as exchanges_used
-FROM trades_history
-WHERE status = 'completed';
+-- View para estatísticas rápidas (tempo constante: lê as tabelas incrementais)
+DROP VIEW IF EXISTS trading_stats;
+CREATE VIEW trading_stats AS
+SELECT
+    t.total_trades,
+    t.total_profit,
+    t.total_profit / NULLIF(t.total_trades, 0) AS avg_profit,
+    t.max_profit,
+    t.min_profit,
+    t.sum_profit_percent / NULLIF(t.total_trades, 0) AS avg_profit_percent,
+    (SELECT COUNT(*) FROM trading_stats_symbols) AS symbols_traded,
+    (SELECT COUNT(*) FROM trading_stats_exchanges) AS exchanges_used
+FROM trading_stats_totals t
+WHERE t.id = 1;
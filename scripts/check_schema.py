@@ -0,0 +1,201 @@
+"""
+Verificação do schema contra um PostgreSQL local
+
+Cria um banco temporário no servidor indicado, aplica o schema do
+SchemaManager (duas vezes, para confirmar que é idempotente) e confere:
+tabelas de que o bot depende, criação de partições diárias (incluindo as
+linhas que caíram na DEFAULT), retenção, upsert dos rollups, gravação de
+oportunidades e trades e a linha de totais lida pela view `trading_stats`.
+O banco temporário é removido no final.
+
+Uso:
+    python scripts/check_schema.py --database-url postgresql://postgres@localhost:5432/postgres
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+import asyncpg  # noqa: E402
+
+from database.connection import DatabaseManager  # noqa: E402
+from database.market_store import MarketDataStore  # noqa: E402
+from database.schema import SchemaManager, default_partition, partition_name  # noqa: E402
+from exchanges.real_market_analyzer import RealTimePrice  # noqa: E402
+from utils.config import Config  # noqa: E402
+
+REQUIRED_TABLES = (
+    'price_history', 'price_rollup_1s', 'price_rollup_1m', 'arbitrage_opportunities',
+    'trades_history', 'bot_config', 'trading_stats_totals', 'trading_stats_symbols',
+    'trading_stats_exchanges', 'trading_stats',
+)
+
+
+class Checker:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, name: str, ok: bool, detail=''):
+        print(f"   {'✅' if ok else '❌'} {name}{f' ({detail})' if detail and not ok else ''}")
+        if not ok:
+            self.failures += 1
+
+
+def _with_database(url: str, database: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=f"/{database}"))
+
+
+async def _count(db, sql: str, *args) -> int:
+    rows = await db.fetch(sql, *args)
+    return rows[0][0]
+
+
+async def check_tables(db, checker: Checker):
+    print("🗄️  Tabelas")
+    for table in REQUIRED_TABLES:
+        rows = await db.fetch("SELECT to_regclass($1) IS NOT NULL AS ok", table)
+        checker.check(table, rows[0]['ok'])
+    rows = await db.fetch("SELECT key, value FROM bot_config")
+    flags = {row['key']: row['value'] for row in rows}
+    checker.check("bot_config com trading_enabled/paper_trading",
+                  flags.get('trading_enabled') == 'true' and flags.get('paper_trading') == 'true', flags)
+    stats = await db.fetch("SELECT total_trades FROM trading_stats")
+    checker.check("trading_stats com a linha de totais", len(stats) == 1 and stats[0]['total_trades'] == 0, stats)
+
+
+async def check_partitions(db, schema: SchemaManager, checker: Checker):
+    print("🗂️  Partições e retenção")
+    today = datetime.now(timezone.utc).date()
+    old_day = today - timedelta(days=schema.retention_days + 2)
+
+    # partições de dias que depois expiram
+    await schema.maintain(old_day)
+    checker.check("partições criadas para o dia e à frente",
+                  set(await schema._partitions('price_history')) >= {
+                      partition_name('price_history', old_day + timedelta(days=offset))
+                      for offset in range(schema.premake_days + 1)
+                  })
+    await db.execute("INSERT INTO price_history (timestamp, symbol, exchange, bid, ask) VALUES ($1, 'CHK/USDT', 'check', 1, 1)",
+                     datetime.combine(old_day, datetime.min.time(), timezone.utc) + timedelta(hours=1))
+
+    # linhas sem partição diária caem na DEFAULT
+    future_day = today + timedelta(days=schema.premake_days + 4)
+    future_ts = datetime.combine(future_day, datetime.min.time(), timezone.utc) + timedelta(hours=12)
+    await db.execute("INSERT INTO price_history (timestamp, symbol, exchange, bid, ask) VALUES ($1, 'CHK/USDT', 'check', 1, 1)",
+                     future_ts)
+    checker.check("linha fora das partições vai para a DEFAULT",
+                  await _count(db, f"SELECT COUNT(*) FROM {default_partition('price_history')}") == 1)
+
+    await schema.maintain(today)
+    partitions = set(await schema._partitions('price_history'))
+    rollup_partitions = set(await schema._partitions('price_rollup_1s'))
+    expected = {today + timedelta(days=offset) for offset in range(schema.premake_days + 1)}
+    checker.check("partições de hoje e à frente (price_history)",
+                  {partition_name('price_history', day) for day in expected} <= partitions)
+    checker.check("partições de hoje e à frente (price_rollup_1s)",
+                  {partition_name('price_rollup_1s', day) for day in expected} <= rollup_partitions)
+    future = partition_name('price_history', future_day)
+    checker.check("dia da DEFAULT ganha partição própria", future in partitions)
+    checker.check("linha movida da DEFAULT para a partição do dia",
+                  future in partitions and await _count(db, f"SELECT COUNT(*) FROM {future}") == 1
+                  and await _count(db, f"SELECT COUNT(*) FROM {default_partition('price_history')}") == 0)
+    checker.check("partições expiradas removidas",
+                  partition_name('price_history', old_day) not in partitions
+                  and partition_name('price_rollup_1s', old_day) not in rollup_partitions)
+    checker.check("linhas expiradas removidas",
+                  await _count(db, "SELECT COUNT(*) FROM price_history WHERE timestamp < $1",
+                               datetime.combine(today, datetime.min.time(), timezone.utc)) == 0)
+
+
+async def check_store(db, checker: Checker):
+    print("📈 Rollups e estatísticas")
+    store = MarketDataStore(db)
+    second = datetime.now().replace(microsecond=0)
+    ticks = [(100.0, 101.0, 100000), (102.0, 103.0, 200000), (99.0, 100.0, 300000)]
+
+    def price(bid, ask, micro):
+        return RealTimePrice(symbol='CHK/USDT', exchange='check', bid=bid, ask=ask, volume_24h=1.0,
+                             timestamp=second.replace(microsecond=micro), spread_percent=0.0)
+
+    # dois flushes no mesmo segundo: o segundo passa pelo ON CONFLICT
+    store.record_prices([price(*tick) for tick in ticks[:2]])
+    await store.flush()
+    store.record_prices([price(*ticks[2])])
+    await store.flush()
+
+    rows = await db.fetch("SELECT open, high, low, close, ticks FROM price_rollup_1s WHERE symbol = 'CHK/USDT'")
+    bar = [(float(r['open']), float(r['high']), float(r['low']), float(r['close']), r['ticks']) for r in rows]
+    checker.check("rollup 1s agregado entre flushes", bar == [(100.5, 102.5, 99.5, 99.5, 3)], bar)
+    rows = await db.fetch("SELECT ticks FROM price_rollup_1m WHERE symbol = 'CHK/USDT'")
+    checker.check("rollup 1m agregado entre flushes", [r['ticks'] for r in rows] == [3], rows)
+
+    await store.record_opportunity({
+        'timestamp': datetime.now(), 'symbol': 'CHK/USDT', 'buy_exchange': 'check', 'sell_exchange': 'other',
+        'buy_price': 100.0, 'sell_price': 101.0, 'profit_percent': 1.0,
+    })
+    checker.check("oportunidade gravada", await _count(db, "SELECT COUNT(*) FROM arbitrage_opportunities") == 1)
+
+    await store.record_trade({
+        'symbol': 'CHK/USDT', 'buy_exchange': 'check', 'sell_exchange': 'other', 'quantity': 1.0,
+        'buy_price': 100.0, 'sell_price': 101.0, 'trade_amount': 100.0, 'gross_profit': 1.0,
+        'total_fees': 0.25, 'profit_percent': 1.0,
+    })
+    rows = await db.fetch("SELECT total_trades, total_profit, symbols_traded, exchanges_used FROM trading_stats")
+    stats = dict(rows[0]) if rows else {}
+    checker.check("trade gravado e trading_stats atualizada",
+                  stats.get('total_trades') == 1 and float(stats.get('total_profit', 0)) == 0.75
+                  and stats.get('symbols_traded') == 1 and stats.get('exchanges_used') == 1, stats)
+
+
+async def run(url: str, keep: bool) -> int:
+    database = f"arbitragex_check_{os.getpid()}"
+    admin = await asyncpg.connect(url)
+    try:
+        await admin.execute(f"CREATE DATABASE {database}")
+    finally:
+        await admin.close()
+    print(f"🧪 Banco temporário: {database}")
+
+    checker = Checker()
+    db = DatabaseManager(_with_database(url, database))
+    try:
+        if not await db.initialize():
+            return 1
+        schema = SchemaManager(db, retention_days=3, premake_days=1)
+        await schema.ensure_schema()
+        await schema.ensure_schema()
+        await check_tables(db, checker)
+        await check_partitions(db, schema, checker)
+        await check_store(db, checker)
+    finally:
+        await db.close()
+        if not keep:
+            admin = await asyncpg.connect(url)
+            try:
+                await admin.execute(f"DROP DATABASE IF EXISTS {database}")
+            finally:
+                await admin.close()
+
+    print(f"{'✅ Schema OK' if not checker.failures else f'❌ {checker.failures} verificações falharam'}")
+    return 1 if checker.failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verificar o schema do ArbitrageX em um PostgreSQL local')
+    parser.add_argument('--database-url', default=None,
+                        help='Servidor onde criar o banco temporário (padrão: variáveis POSTGRES_*)')
+    parser.add_argument('--keep', action='store_true', help='Não remover o banco temporário no final')
+    args = parser.parse_args(argv)
+    sys.exit(asyncio.run(run(args.database_url or Config().database_url, args.keep)))
+
+
+if __name__ == '__main__':
+    main()
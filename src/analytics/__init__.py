@@ -0,0 +1 @@
+# ArbitrageX Package
\ No newline at end of file
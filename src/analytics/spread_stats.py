@@ -0,0 +1,199 @@
+"""
+Estatísticas móveis de spread por rota (symbol, buy_exchange, sell_exchange)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+# (symbol, buy_exchange, sell_exchange)
+PairKey = Tuple[str, str, str]
+
+
+@dataclass
+class SpreadSnapshot:
+    """Estatísticas atuais de uma rota"""
+    count: int
+    last: float
+    mean: float
+    std: float
+    min: float
+    max: float
+    ewma: float
+    ewm_std: float
+    zscore: float
+    streak: int
+
+
+class SpreadStatistics:
+    """
+    Janelas móveis de spread com atualização O(1) por tick.
+
+    Cada rota ocupa uma linha de arrays numpy pré-alocados: um ring buffer
+    de `window` valores, média/M2 da janela (Welford deslizante), min/max da
+    janela e média/variância exponenciais (EWMA) usadas no z-score. O z-score
+    de cada tick é calculado contra as estatísticas anteriores ao tick, e
+    `streak` conta ticks consecutivos com z-score acima de `z_threshold`.
+    """
+
+    def __init__(self, window: int = 120, halflife: float = 30.0, z_threshold: float = 2.0,
+                 capacity: int = 64):
+        self.window = window
+        self.alpha = 1.0 - math.exp(math.log(0.5) / halflife)
+        self.z_threshold = z_threshold
+        self._index: Dict[PairKey, int] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.values = np.zeros((capacity, self.window))
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.pos = np.zeros(capacity, dtype=np.int64)
+        self.mean = np.zeros(capacity)
+        self.m2 = np.zeros(capacity)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.ewma = np.zeros(capacity)
+        self.ewm_var = np.zeros(capacity)
+        self.zscore = np.zeros(capacity)
+        self.streak = np.zeros(capacity, dtype=np.int64)
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in
+               ('values', 'count', 'pos', 'mean', 'm2', 'min', 'max', 'ewma', 'ewm_var', 'zscore', 'streak')}
+        size = self.capacity
+        self._allocate(size * 2)
+        for name, array in old.items():
+            getattr(self, name)[:size] = array
+
+    def pair_index(self, symbol: str, buy_exchange: str, sell_exchange: str) -> int:
+        """Índice da rota, alocando uma linha na primeira vez"""
+        key = (symbol, buy_exchange, sell_exchange)
+        index = self._index.get(key)
+        if index is None:
+            index = len(self._index)
+            if index >= self.capacity:
+                self._grow()
+            self._index[key] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def update(self, index: int, spread: float) -> float:
+        """Registrar um spread para uma rota e retornar seu z-score"""
+        window = self.window
+        n = int(self.count[index])
+        pos = int(self.pos[index])
+        mean = float(self.mean[index])
+        evicted = float(self.values[index, pos])
+
+        # z-score contra o histórico (antes de incorporar o tick)
+        ewma = float(self.ewma[index])
+        ewm_var = float(self.ewm_var[index])
+        if n == 0:
+            z = 0.0
+            ewma, ewm_var = spread, 0.0
+        else:
+            z = (spread - ewma) / math.sqrt(ewm_var) if ewm_var > 0.0 else 0.0
+            delta = spread - ewma
+            ewma += self.alpha * delta
+            ewm_var = (1.0 - self.alpha) * (ewm_var + self.alpha * delta * delta)
+        self.ewma[index] = ewma
+        self.ewm_var[index] = ewm_var
+        self.zscore[index] = z
+        self.streak[index] = self.streak[index] + 1 if z >= self.z_threshold else 0
+
+        # Welford deslizante sobre a janela
+        self.values[index, pos] = spread
+        self.pos[index] = (pos + 1) % window
+        if n < window:
+            n += 1
+            self.count[index] = n
+            new_mean = mean + (spread - mean) / n
+            self.m2[index] += (spread - mean) * (spread - new_mean)
+        else:
+            new_mean = mean + (spread - evicted) / window
+            self.m2[index] += (spread - evicted) * (spread - new_mean + evicted - mean)
+        self.mean[index] = new_mean
+
+        # min/max: só recalcula a janela quando o valor removido era o extremo
+        if n == window and (evicted == self.min[index] or evicted == self.max[index]):
+            row = self.values[index]
+            self.min[index] = row.min()
+            self.max[index] = row.max()
+        else:
+            if spread < self.min[index]:
+                self.min[index] = spread
+            if spread > self.max[index]:
+                self.max[index] = spread
+        return z
+
+    def update_many(self, indices: np.ndarray, spreads: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de update() para muitas rotas distintas no mesmo tick"""
+        indices = np.asarray(indices, dtype=np.int64)
+        spreads = np.asarray(spreads, dtype=np.float64)
+        window = self.window
+        alpha = self.alpha
+
+        n = self.count[indices]
+        pos = self.pos[indices]
+        mean = self.mean[indices]
+        evicted = self.values[indices, pos]
+        first = n == 0
+
+        ewma = self.ewma[indices]
+        ewm_var = self.ewm_var[indices]
+        std = np.sqrt(ewm_var)
+        z = np.divide(spreads - ewma, std, out=np.zeros_like(spreads), where=std > 0.0)
+        z[first] = 0.0
+        delta = spreads - ewma
+        self.ewma[indices] = np.where(first, spreads, ewma + alpha * delta)
+        self.ewm_var[indices] = np.where(first, 0.0, (1.0 - alpha) * (ewm_var + alpha * delta * delta))
+        self.zscore[indices] = z
+        self.streak[indices] = np.where(z >= self.z_threshold, self.streak[indices] + 1, 0)
+
+        self.values[indices, pos] = spreads
+        self.pos[indices] = (pos + 1) % window
+        full = n >= window
+        n_new = np.where(full, window, n + 1)
+        self.count[indices] = n_new
+        new_mean = np.where(full, mean + (spreads - evicted) / window, mean + (spreads - mean) / n_new)
+        self.m2[indices] += np.where(full,
+                                     (spreads - evicted) * (spreads - new_mean + evicted - mean),
+                                     (spreads - mean) * (spreads - new_mean))
+        self.mean[indices] = new_mean
+
+        cur_min = self.min[indices]
+        cur_max = self.max[indices]
+        stale = full & ((evicted == cur_min) | (evicted == cur_max))
+        self.min[indices] = np.minimum(cur_min, spreads)
+        self.max[indices] = np.maximum(cur_max, spreads)
+        if stale.any():
+            rows = indices[stale]
+            self.min[rows] = self.values[rows].min(axis=1)
+            self.max[rows] = self.values[rows].max(axis=1)
+        return z
+
+    def is_persistent(self, index: int, min_streak: int, min_samples: int) -> bool:
+        """Dislocação estatisticamente persistente: z-score alto por `min_streak` ticks seguidos"""
+        return self.count[index] >= min_samples and self.streak[index] >= min_streak
+
+    def snapshot(self, symbol: str, buy_exchange: str, sell_exchange: str) -> SpreadSnapshot:
+        index = self._index[(symbol, buy_exchange, sell_exchange)]
+        n = int(self.count[index])
+        last = float(self.values[index, (self.pos[index] - 1) % self.window]) if n else 0.0
+        return SpreadSnapshot(
+            count=n,
+            last=last,
+            mean=float(self.mean[index]),
+            std=math.sqrt(self.m2[index] / (n - 1)) if n > 1 else 0.0,
+            min=float(self.min[index]),
+            max=float(self.max[index]),
+            ewma=float(self.ewma[index]),
+            ewm_std=math.sqrt(self.ewm_var[index]),
+            zscore=float(self.zscore[index]),
+            streak=int(self.streak[index])
+        )
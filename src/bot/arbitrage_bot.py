@@ -2,24 +2,41 @@ import asyncio
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
-import aiohttp
-from prometheus_client import start_http_server
 
+from analytics.spread_stats import SpreadStatistics
+from bot.opportunity_cache import OpportunityCache
 from exchanges.real_market_analyzer import RealMarketAnalyzer
+from monitoring.metrics import DEFAULT_STRATEGY, MetricsCollector
 from utils.logger import setup_logger
+from utils.runtime_config import RuntimeConfig
 
 class ArbitrageBot:
-    def __init__(self, config, db_manager=None, metrics=None):
+    def __init__(self, config, db_manager=None, metrics=None, runtime_config=None, market_store=None,
+                 notifier=None, market_analyzer=None, name: str = DEFAULT_STRATEGY):
         self.config = config
+        # Nome da estratégia (label `strategy` nas métricas e prefixo dos logs)
+        self.name = name
+        self.tag = f"[{name}] " if name != DEFAULT_STRATEGY else ""
         self.db_manager = db_manager
+        self.market_store = market_store
+        self.notifier = notifier
         self.metrics = metrics or MetricsCollector()
         self.logger = setup_logger(__name__)
-        self.market_analyzer = RealMarketAnalyzer(config)
+        # Analyzer pode vir pronto (conexões já aquecidas durante a inicialização)
+        self.market_analyzer = market_analyzer or RealMarketAnalyzer(config, metrics=self.metrics)
         # Suporte tanto para dict quanto para objeto Config
         if hasattr(config, 'initial_balance'):
             self.balance = float(getattr(config, 'initial_balance', 10000))
             self.min_profit_percent = float(getattr(config, 'min_profit_percent', 0.3))
             self.max_trade_amount = float(getattr(config, 'max_trade_amount', 1000))
+            opportunity_ttl = float(getattr(config, 'opportunity_ttl_seconds', 30))
+            opportunity_hysteresis = float(getattr(config, 'opportunity_hysteresis_percent', 0.05))
+            self.signal_mode = getattr(config, 'signal_mode', 'threshold')
+            spread_window = int(getattr(config, 'spread_window', 120))
+            spread_halflife = float(getattr(config, 'spread_halflife', 30))
+            signal_zscore = float(getattr(config, 'signal_zscore', 2.0))
+            self.signal_persistence = int(getattr(config, 'signal_persistence', 3))
+            self.signal_min_samples = int(getattr(config, 'signal_min_samples', 30))
             # Corrige: aceita lista OU string para trading_symbols
             trading_symbols = getattr(config, 'trading_symbols', 'BTC/USDT,ETH/USDT')
             if isinstance(trading_symbols, list):
@@ -30,35 +47,93 @@ class ArbitrageBot:
             self.balance = float(config.get('INITIAL_BALANCE', 10000))
             self.min_profit_percent = float(config.get('MIN_PROFIT_PERCENT', 0.3))
             self.max_trade_amount = float(config.get('MAX_TRADE_AMOUNT', 1000))
+            opportunity_ttl = float(config.get('OPPORTUNITY_TTL_SECONDS', 30))
+            opportunity_hysteresis = float(config.get('OPPORTUNITY_HYSTERESIS_PERCENT', 0.05))
+            self.signal_mode = config.get('SIGNAL_MODE', 'threshold')
+            spread_window = int(config.get('SPREAD_WINDOW', 120))
+            spread_halflife = float(config.get('SPREAD_HALFLIFE', 30))
+            signal_zscore = float(config.get('SIGNAL_ZSCORE', 2.0))
+            self.signal_persistence = int(config.get('SIGNAL_PERSISTENCE', 3))
+            self.signal_min_samples = int(config.get('SIGNAL_MIN_SAMPLES', 30))
             trading_symbols = config.get('TRADING_SYMBOLS', 'BTC/USDT,ETH/USDT')
             if isinstance(trading_symbols, list):
                 self.trading_symbols = trading_symbols
             else:
                 self.trading_symbols = trading_symbols.split(',')
 
-        # Inicializar servidor de métricas (apenas uma vez)
-        self._metrics_server_started = False
-        self._start_metrics_server()
-
-    def _start_metrics_server(self):
-        """Iniciar servidor de métricas apenas uma vez"""
-        if not self._metrics_server_started:
-            try:
-                start_http_server(8000)
-                self.logger.info("📊 Servidor de métricas iniciado na porta 8000")
-                self._metrics_server_started = True
-            except OSError as e:
-                if "Address already in use" in str(e):
-                    self.logger.info("📊 Servidor de métricas já está rodando na porta 8000")
-                    self._metrics_server_started = True
-                else:
-                    self.logger.warning(f"⚠️ Erro ao iniciar servidor de métricas: {e}")
-            except Exception as e:
-                self.logger.warning(f"⚠️ Erro ao iniciar servidor de métricas: {e}")
+        self.initial_balance = self.balance
+        # Controlados por bot_config; só existe execução simulada (paper trading)
+        self.trading_enabled = True
+        self.paper_trading = True
+        self.opportunities_found = 0
+        self.trades_executed = 0
+
+        # Cache de oportunidades: evita re-executar o mesmo spread a cada ciclo
+        self.opportunity_cache = OpportunityCache(
+            ttl_seconds=opportunity_ttl,
+            hysteresis_percent=opportunity_hysteresis
+        )
+
+        # Estatísticas móveis de spread para todas as rotas (symbol, buy, sell)
+        self.spread_stats = SpreadStatistics(
+            window=spread_window,
+            halflife=spread_halflife,
+            z_threshold=signal_zscore
+        )
+
+        # Configuração recarregável de bot_config, aplicada sobre a config deste
+        # bot (e não sobre a do ambiente: numa estratégia os valores são outros)
+        self.runtime_config = runtime_config
+        if runtime_config is not None:
+            self._runtime_base = RuntimeConfig(
+                min_profit_percent=self.min_profit_percent,
+                max_trade_amount=self.max_trade_amount,
+                trading_symbols=tuple(s.strip() for s in self.trading_symbols if s.strip())
+            )
+            if runtime_config.values:
+                self._on_runtime_config(runtime_config.snapshot)
+            runtime_config.subscribe(self._on_runtime_config)
+
+    def _on_runtime_config(self, snapshot):
+        """Novo bot_config: refazer o snapshot a partir da config própria"""
+        self._apply_runtime_config(self.runtime_config.layered(self._runtime_base))
+
+    def _apply_runtime_config(self, snapshot):
+        """Aplicar snapshot de configuração recarregado em runtime"""
+        self.min_profit_percent = snapshot.min_profit_percent
+        self.max_trade_amount = snapshot.max_trade_amount
+        self.trading_symbols = list(snapshot.trading_symbols)
+        self.trading_enabled = snapshot.trading_enabled
+        self.paper_trading = snapshot.paper_trading
+        self.logger.info(f"⚙️  {self.tag}Configuração v{snapshot.version} aplicada ao bot")
+        if not self.trading_enabled:
+            self.logger.warning(f"⏸️  {self.tag}Trading desabilitado em bot_config: oportunidades apenas registradas")
+        elif not self.paper_trading:
+            self.logger.error(f"⛔ {self.tag}paper_trading=false, mas a execução real não está implementada: "
+                              f"trades não serão executados")
+
+    def _update_spread_stats(self, symbol: str, price_dict: Dict[str, float]):
+        """Atualizar estatísticas de spread de todas as rotas do símbolo"""
+        for buy_exchange, buy_price in price_dict.items():
+            for sell_exchange, sell_price in price_dict.items():
+                if buy_exchange != sell_exchange:
+                    index = self.spread_stats.pair_index(symbol, buy_exchange, sell_exchange)
+                    self.spread_stats.update(index, ((sell_price - buy_price) / buy_price) * 100)
+
+    def _is_signal(self, symbol: str, buy_exchange: str, sell_exchange: str, profit_percent: float) -> bool:
+        """Decidir se o spread da rota é uma oportunidade conforme o modo de sinal"""
+        if self.signal_mode == 'zscore':
+            index = self.spread_stats.pair_index(symbol, buy_exchange, sell_exchange)
+            return profit_percent > 0 and self.spread_stats.is_persistent(
+                index, self.signal_persistence, self.signal_min_samples
+            )
+        return profit_percent >= self.min_profit_percent
 
     async def find_arbitrage_opportunities(self) -> List[Dict]:
         """Encontra oportunidades de arbitragem e simula ação ao identificar uma oportunidade"""
         opportunities = []
+        # símbolos novos (bot_config) ou cache vencido: descobrir pares em segundo plano
+        self.market_analyzer.refresh_metadata(self.trading_symbols)
 
         try:
             for symbol in self.trading_symbols:
@@ -67,55 +142,93 @@ class ArbitrageBot:
 
                 # Buscar preços em múltiplas exchanges
                 prices = await self.market_analyzer.fetch_all_prices(symbol)
+                self.record_prices(symbol, prices)
 
-                # Log detalhado: preço por exchange
-                for ex, price in prices.items():
-                    self.logger.info(f"   📈 {symbol} @ {ex}: Bid=${price.bid:.4f} Ask=${price.ask:.4f} Vol24h={price.volume_24h:.2f} Spread={price.spread_percent:.3f}%")
+                opportunity = await self.evaluate_prices(symbol, prices)
+                if opportunity:
+                    opportunities.append(opportunity)
 
-                price_dict = {ex: price.ask for ex, price in prices.items()}
+                # Pequena pausa entre símbolos
+                await asyncio.sleep(0.1)
 
-                if len(price_dict) >= 2:
-                    # Encontrar maior e menor preço
-                    sorted_prices = sorted(price_dict.items(), key=lambda x: x[1])
-                    lowest_exchange, lowest_price = sorted_prices[0]
-                    highest_exchange, highest_price = sorted_prices[-1]
+            self.close_expired_opportunities()
 
-                    # Calcular diferença percentual
-                    price_diff_percent = ((highest_price - lowest_price) / lowest_price) * 100
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao buscar oportunidades: {e}")
 
-                    if price_diff_percent >= self.min_profit_percent:
-                        opportunity = {
-                            'symbol': symbol,
-                            'buy_exchange': lowest_exchange,
-                            'sell_exchange': highest_exchange,
-                            'buy_price': lowest_price,
-                            'sell_price': highest_price,
-                            'profit_percent': price_diff_percent,
-                            'timestamp': datetime.now()
-                        }
-                        opportunities.append(opportunity)
+        return opportunities
 
-                        # Incrementar contador de oportunidades
-                        self.metrics.opportunities_found.inc()
+    def record_prices(self, symbol: str, prices: Dict):
+        """Logar e persistir as cotações de um símbolo"""
+        # Log detalhado: preço por exchange
+        for ex, price in prices.items():
+            self.logger.info(f"   📈 {symbol} @ {ex}: Bid=${price.bid:.4f} Ask=${price.ask:.4f} Vol24h={price.volume_24h:.2f} Spread={price.spread_percent:.3f}%")
+
+        if self.market_store:
+            self.market_store.record_prices(prices.values())
+
+    async def evaluate_prices(self, symbol: str, prices: Dict) -> Optional[Dict]:
+        """Avaliar as cotações de um símbolo; retorna a oportunidade nova, se houver"""
+        price_dict = {ex: price.ask for ex, price in prices.items()}
+        if len(price_dict) < 2:
+            return None
+
+        self._update_spread_stats(symbol, price_dict)
+
+        # Encontrar maior e menor preço
+        sorted_prices = sorted(price_dict.items(), key=lambda x: x[1])
+        lowest_exchange, lowest_price = sorted_prices[0]
+        highest_exchange, highest_price = sorted_prices[-1]
+
+        # Calcular diferença percentual
+        price_diff_percent = ((highest_price - lowest_price) / lowest_price) * 100
+        route_metrics = self.metrics.route(symbol, lowest_exchange, highest_exchange)
+        route_metrics.spread.set(price_diff_percent)
+
+        if not self._is_signal(symbol, lowest_exchange, highest_exchange, price_diff_percent):
+            return None
+
+        opportunity = {
+            'strategy': self.name,
+            'symbol': symbol,
+            'buy_exchange': lowest_exchange,
+            'sell_exchange': highest_exchange,
+            'buy_price': lowest_price,
+            'sell_price': highest_price,
+            'profit_percent': price_diff_percent,
+            'timestamp': datetime.now()
+        }
 
-                        self.logger.info(f"🎯 Oportunidade encontrada: {symbol} - {price_diff_percent:.2f}% profit")
-                        self.logger.info(f"   Comprar em {lowest_exchange}: ${lowest_price:.2f}")
-                        self.logger.info(f"   Vender em {highest_exchange}: ${highest_price:.2f}")
+        # Emitir apenas oportunidades novas ou com mudança relevante
+        if not self.opportunity_cache.observe(opportunity):
+            self.logger.debug(f"↩️  {self.tag}Oportunidade repetida ignorada: {symbol} {lowest_exchange} → {highest_exchange} ({price_diff_percent:.2f}%)")
+            return None
 
-                        # Simulação de ação: executar trade simulado
-                        await self.simulate_action(opportunity)
+        # Incrementar contador de oportunidades
+        route_metrics.opportunities.inc()
 
-                # Pequena pausa entre símbolos
-                await asyncio.sleep(0.1)
+        self.logger.info(f"🎯 {self.tag}Oportunidade encontrada: {symbol} - {price_diff_percent:.2f}% profit")
+        self.logger.info(f"   Comprar em {lowest_exchange}: ${lowest_price:.2f}")
+        self.logger.info(f"   Vender em {highest_exchange}: ${highest_price:.2f}")
 
-        except Exception as e:
-            self.logger.error(f"❌ Erro ao buscar oportunidades: {e}")
+        # Alerta enfileirado; o envio acontece fora do loop
+        if self.notifier:
+            self.notifier.notify_opportunity(opportunity)
 
-        return opportunities
+        # Simulação de ação: executar trade simulado
+        await self.simulate_action(opportunity)
+        return opportunity
+
+    def close_expired_opportunities(self):
+        """Encerrar oportunidades que deixaram de existir"""
+        for record in self.opportunity_cache.evict_expired():
+            self.logger.info(f"⌛ {self.tag}Oportunidade encerrada: {record.symbol} {record.buy_exchange} → {record.sell_exchange} "
+                             f"durou {record.duration:.1f}s, pico {record.peak_profit_percent:.2f}%, "
+                             f"{record.observations} observações")
 
     async def simulate_action(self, opportunity: Dict):
         """Simula a execução de uma ação de arbitragem ao identificar uma oportunidade"""
-        self.logger.info(f"🟢 Simulando ação: Comprando {opportunity['symbol']} em {opportunity['buy_exchange']} por ${opportunity['buy_price']:.2f} e vendendo em {opportunity['sell_exchange']} por ${opportunity['sell_price']:.2f}")
+        self.logger.info(f"🟢 {self.tag}Simulando ação: Comprando {opportunity['symbol']} em {opportunity['buy_exchange']} por ${opportunity['buy_price']:.2f} e vendendo em {opportunity['sell_exchange']} por ${opportunity['sell_price']:.2f}")
         # Simular latência
         await asyncio.sleep(0.2)
         # Simular resultado
@@ -137,7 +250,7 @@ class ArbitrageBot:
             quantity = trade_amount / buy_price
 
             # Simular execução do trade
-            self.logger.info(f"🚀 Executando trade: {symbol}")
+            self.logger.info(f"🚀 {self.tag}Executando trade: {symbol}")
             self.logger.info(f"   💰 Quantidade: {quantity:.6f} {symbol.split('/')[0]}")
             self.logger.info(f"   📊 Valor: ${trade_amount:.2f}")
 
@@ -151,24 +264,71 @@ class ArbitrageBot:
             self.balance += profit
 
             # Atualizar métricas
-            self.metrics.trades_total.inc()
-            self.metrics.profit_total.inc(profit)
+            symbol_metrics = self.metrics.symbol(symbol)
+            symbol_metrics.trades.inc()
+            symbol_metrics.profit.inc(profit)
             self.metrics.balance_gauge.set(self.balance)
 
             # Registrar duração do trade
             duration = asyncio.get_event_loop().time() - start_time
             self.metrics.trade_duration.observe(duration)
 
-            self.logger.info(f"✅ Trade executado com sucesso!")
+            if self.notifier:
+                self.notifier.notify_trade(opportunity, profit, self.balance)
+
+            if self.market_store:
+                opportunity['trade_amount'] = trade_amount
+                await self.market_store.record_trade({
+                    'symbol': symbol,
+                    'buy_exchange': opportunity['buy_exchange'],
+                    'sell_exchange': opportunity['sell_exchange'],
+                    'quantity': quantity,
+                    'buy_price': buy_price,
+                    'sell_price': sell_price,
+                    'trade_amount': trade_amount,
+                    'gross_profit': profit,
+                    'profit_percent': profit_percent
+                })
+
+            self.logger.info(f"✅ {self.tag}Trade executado com sucesso!")
             self.logger.info(f"   💵 Lucro: ${profit:.2f}")
             self.logger.info(f"   💰 Balance atual: ${self.balance:.2f}")
 
             return True
 
         except Exception as e:
-            self.logger.error(f"❌ Erro ao executar trade: {e}")
+            self.logger.error(f"❌ {self.tag}Erro ao executar trade: {e}")
             return False
 
+    async def process_opportunities(self, opportunities: List[Dict]) -> int:
+        """Executar trades para as oportunidades e registrar no histórico"""
+        executed_count = 0
+        can_execute = self.trading_enabled and self.paper_trading
+        for opportunity in opportunities:
+            executed = await self.execute_arbitrage_trade(opportunity) if can_execute else False
+            if executed:
+                executed_count += 1
+            if self.market_store:
+                await self.market_store.record_opportunity(opportunity, executed)
+
+        self.opportunities_found += len(opportunities)
+        self.trades_executed += executed_count
+        return executed_count
+
+    def summary(self) -> Dict:
+        """Resultado e parâmetros atuais da estratégia"""
+        return {
+            'strategy': self.name,
+            'balance': self.balance,
+            'total_profit': self.balance - self.initial_balance,
+            'opportunities_found': self.opportunities_found,
+            'trades_executed': self.trades_executed,
+            'signal_mode': self.signal_mode,
+            'min_profit_percent': self.min_profit_percent,
+            'max_trade_amount': self.max_trade_amount,
+            'trading_symbols': [symbol.strip() for symbol in self.trading_symbols],
+        }
+
     async def run_paper_trading(self, duration_minutes: float = 60):
         """Executa paper trading por um período determinado"""
         self.logger.info(f"🚀 Iniciando paper trading por {duration_minutes} minutos...")
@@ -177,19 +337,13 @@ class ArbitrageBot:
         start_time = asyncio.get_event_loop().time()
         end_time = start_time + (duration_minutes * 60)
 
-        trades_executed = 0
-        opportunities_found = 0
-
         while asyncio.get_event_loop().time() < end_time:
             try:
                 # Buscar oportunidades
                 opportunities = await self.find_arbitrage_opportunities()
-                opportunities_found += len(opportunities)
 
                 # Executar trades para oportunidades válidas
-                for opportunity in opportunities:
-                    if await self.execute_arbitrage_trade(opportunity):
-                        trades_executed += 1
+                await self.process_opportunities(opportunities)
 
                 # Aguardar antes da próxima análise
                 await asyncio.sleep(5)  # Análise a cada 5 segundos
@@ -203,22 +357,19 @@ class ArbitrageBot:
 
         # Relatório final
         total_time = (asyncio.get_event_loop().time() - start_time) / 60
-        if hasattr(self.config, 'initial_balance'):
-            total_profit = self.balance - float(getattr(self.config, 'initial_balance', 10000))
-        else:
-            total_profit = self.balance - float(self.config.get('INITIAL_BALANCE', 10000))
+        total_profit = self.balance - self.initial_balance
 
         self.logger.info(f"📊 Paper Trading Finalizado!")
         self.logger.info(f"   ⏱️ Tempo total: {total_time:.1f} minutos")
-        self.logger.info(f"   🎯 Oportunidades encontradas: {opportunities_found}")
-        self.logger.info(f"   🚀 Trades executados: {trades_executed}")
+        self.logger.info(f"   🎯 Oportunidades encontradas: {self.opportunities_found}")
+        self.logger.info(f"   🚀 Trades executados: {self.trades_executed}")
         self.logger.info(f"   💵 Lucro total: ${total_profit:.2f}")
         self.logger.info(f"   💰 Balance final: ${self.balance:.2f}")
 
         return {
             'duration_minutes': total_time,
-            'opportunities_found': opportunities_found,
-            'trades_executed': trades_executed,
+            'opportunities_found': self.opportunities_found,
+            'trades_executed': self.trades_executed,
             'total_profit': total_profit,
             'final_balance': self.balance
         }
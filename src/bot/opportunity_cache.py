@@ -0,0 +1,108 @@
+"""
+Cache de oportunidades do ArbitrageX - de-duplicação e cooldown por spread
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+# (symbol, buy_exchange, sell_exchange)
+OpportunityKey = Tuple[str, str, str]
+
+
+@dataclass
+class OpportunityRecord:
+    """Registro de vida de uma oportunidade"""
+    symbol: str
+    buy_exchange: str
+    sell_exchange: str
+    first_seen: float
+    last_seen: float
+    peak_profit_percent: float
+    last_profit_percent: float
+    emitted_profit_percent: float
+    observations: int = 1
+    emissions: int = 1
+
+    @property
+    def key(self) -> OpportunityKey:
+        return (self.symbol, self.buy_exchange, self.sell_exchange)
+
+    @property
+    def duration(self) -> float:
+        """Duração observada da oportunidade em segundos"""
+        return self.last_seen - self.first_seen
+
+
+class OpportunityCache:
+    """
+    Cache de oportunidades indexado por (symbol, buy_exchange, sell_exchange).
+
+    Uma oportunidade só é emitida quando é nova ou quando o lucro se afasta
+    do último valor emitido por mais que a banda de histerese. Registros não
+    observados por mais de `ttl_seconds` são despejados e o ciclo de vida é
+    guardado em `closed`.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, hysteresis_percent: float = 0.05,
+                 max_closed: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.hysteresis_percent = hysteresis_percent
+        self.max_closed = max_closed
+        self.active: Dict[OpportunityKey, OpportunityRecord] = {}
+        self.closed: List[OpportunityRecord] = []
+
+    def observe(self, opportunity: Dict, now: Optional[float] = None) -> bool:
+        """Registrar uma oportunidade detectada; retorna True se deve ser emitida"""
+        now = time.monotonic() if now is None else now
+        key = (opportunity['symbol'], opportunity['buy_exchange'], opportunity['sell_exchange'])
+        profit = opportunity['profit_percent']
+
+        record = self.active.get(key)
+        if record is not None and now - record.last_seen > self.ttl_seconds:
+            self._close(record)
+            record = None
+
+        if record is None:
+            self.active[key] = OpportunityRecord(
+                symbol=key[0],
+                buy_exchange=key[1],
+                sell_exchange=key[2],
+                first_seen=now,
+                last_seen=now,
+                peak_profit_percent=profit,
+                last_profit_percent=profit,
+                emitted_profit_percent=profit
+            )
+            return True
+
+        record.last_seen = now
+        record.last_profit_percent = profit
+        record.observations += 1
+        if profit > record.peak_profit_percent:
+            record.peak_profit_percent = profit
+
+        if abs(profit - record.emitted_profit_percent) >= self.hysteresis_percent:
+            record.emitted_profit_percent = profit
+            record.emissions += 1
+            return True
+
+        return False
+
+    def evict_expired(self, now: Optional[float] = None) -> List[OpportunityRecord]:
+        """Remover oportunidades expiradas e retornar seus registros"""
+        now = time.monotonic() if now is None else now
+        expired = [record for record in self.active.values()
+                   if now - record.last_seen > self.ttl_seconds]
+        for record in expired:
+            del self.active[record.key]
+            self._close(record)
+        return expired
+
+    def _close(self, record: OpportunityRecord):
+        self.closed.append(record)
+        if len(self.closed) > self.max_closed:
+            del self.closed[:len(self.closed) - self.max_closed]
+
+    def __len__(self) -> int:
+        return len(self.active)
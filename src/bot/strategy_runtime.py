@@ -0,0 +1,190 @@
+"""
+Várias estratégias no mesmo processo sobre um único feed de cotações
+"""
+
+import asyncio
+import dataclasses
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bot.arbitrage_bot import ArbitrageBot
+
+logger = logging.getLogger(__name__)
+
+# Campos do Config que cada estratégia pode sobrescrever
+STRATEGY_FIELDS = (
+    'initial_balance', 'min_profit_percent', 'max_trade_amount',
+    'opportunity_ttl_seconds', 'opportunity_hysteresis_percent',
+    'signal_mode', 'spread_window', 'spread_halflife', 'signal_zscore',
+    'signal_persistence', 'signal_min_samples', 'trading_symbols',
+)
+
+
+def load_strategies(config) -> List[Tuple[str, object]]:
+    """
+    Ler STRATEGIES_FILE: lista de estratégias (ou {"strategies": [...]}), cada
+    uma com `name` e parâmetros que sobrescrevem o Config base.
+    """
+    if not config.strategies_file:
+        return []
+    data = json.loads(Path(config.strategies_file).read_text())
+    if isinstance(data, dict):
+        data = data.get('strategies', [])
+
+    strategies = []
+    names = set()
+    for entry in data:
+        entry = dict(entry)
+        name = str(entry.pop('name', '')).strip()
+        if not name:
+            raise ValueError(f"{config.strategies_file}: estratégia sem 'name'")
+        if name in names:
+            raise ValueError(f"{config.strategies_file}: estratégia duplicada '{name}'")
+        unknown = set(entry) - set(STRATEGY_FIELDS)
+        if unknown:
+            raise ValueError(f"{config.strategies_file}: parâmetros inválidos em '{name}': {', '.join(sorted(unknown))}")
+        if isinstance(entry.get('trading_symbols'), str):
+            entry['trading_symbols'] = entry['trading_symbols'].split(',')
+        names.add(name)
+        strategies.append((name, dataclasses.replace(config, **entry)))
+
+    if not strategies:
+        raise ValueError(f"{config.strategies_file}: nenhuma estratégia configurada")
+    return strategies
+
+
+class StrategyRuntime:
+    """
+    Hospeda várias estratégias (instâncias de ArbitrageBot) no mesmo processo.
+
+    Cada estratégia tem limites, símbolos, balance e label `strategy` próprios
+    nas métricas, mas todas usam o mesmo RealMarketAnalyzer: a cada ciclo cada
+    símbolo é buscado uma única vez e o mesmo dict de cotações é entregue, sem
+    cópia, a todas as estratégias inscritas nele. A avaliação roda em tasks
+    separadas das buscas, então o feed não espera pelas estratégias.
+
+    A primeira estratégia é a principal: persiste trades e oportunidades, envia
+    alertas e segue o bot_config recarregável. As demais rodam em sombra (A/B),
+    com resultado nas métricas, nos logs e em /api/strategies.
+    """
+
+    def __init__(self, strategies: List[Tuple[str, object]], market_analyzer, metrics, db_manager=None,
+                 runtime_config=None, market_store=None, notifier=None):
+        self.market_analyzer = market_analyzer
+        self.strategies: List[ArbitrageBot] = []
+        self.fetches = 0
+        self.deliveries = 0
+
+        exchanges = list(market_analyzer.api_endpoints)
+        for i, (name, config) in enumerate(strategies):
+            primary = i == 0
+            bot = ArbitrageBot(
+                config=config,
+                db_manager=db_manager,
+                metrics=metrics.strategy(name),
+                runtime_config=runtime_config if primary else None,
+                market_store=market_store if primary else None,
+                notifier=notifier if primary else None,
+                market_analyzer=market_analyzer,
+                name=name
+            )
+            bot.metrics.bind(bot.trading_symbols, exchanges)
+            self.strategies.append(bot)
+
+        logger.info(f"🧩 {len(self.strategies)} estratégias: {', '.join(bot.name for bot in self.strategies)} "
+                    f"(principal: {self.primary.name})")
+
+    @property
+    def primary(self) -> ArbitrageBot:
+        return self.strategies[0]
+
+    def subscriptions(self) -> 'OrderedDict[str, List[ArbitrageBot]]':
+        """Estratégias inscritas em cada símbolo (refeito a cada ciclo: os símbolos mudam em runtime)"""
+        subscribers = OrderedDict()
+        for bot in self.strategies:
+            for symbol in bot.trading_symbols:
+                subscribers.setdefault(symbol.strip(), []).append(bot)
+        return subscribers
+
+    async def find_arbitrage_opportunities(self) -> Dict[str, List[Dict]]:
+        """Um ciclo do feed compartilhado: oportunidades novas por estratégia"""
+        found = {bot.name: [] for bot in self.strategies}
+        evaluations = []
+        subscriptions = self.subscriptions()
+        # símbolos novos (bot_config) ou cache vencido: descobrir pares em segundo plano
+        self.market_analyzer.refresh_metadata(subscriptions)
+
+        for symbol, subscribers in subscriptions.items():
+            try:
+                logger.info(f"🔍 Analisando {symbol} ({', '.join(bot.name for bot in subscribers)})...")
+                prices = await self.market_analyzer.fetch_all_prices(symbol)
+                self.fetches += 1
+                self.primary.record_prices(symbol, prices)
+
+                # Avaliação em tasks próprias: uma estratégia lenta ou com erro
+                # não atrasa a busca do próximo símbolo
+                for bot in subscribers:
+                    evaluations.append((bot, symbol, asyncio.create_task(bot.evaluate_prices(symbol, prices))))
+                self.deliveries += len(subscribers)
+            except Exception as e:
+                logger.error(f"❌ Erro ao buscar oportunidades de {symbol}: {e}")
+
+            # Pequena pausa entre símbolos
+            await asyncio.sleep(0.1)
+
+        results = await asyncio.gather(*(task for _, _, task in evaluations), return_exceptions=True)
+        for (bot, symbol, _), result in zip(evaluations, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {bot.tag}Erro ao avaliar {symbol}: {result}")
+            elif result:
+                found[bot.name].append(result)
+
+        for bot in self.strategies:
+            bot.close_expired_opportunities()
+        return found
+
+    async def run_paper_trading(self, duration_minutes: float = 60):
+        """Executa paper trading de todas as estratégias por um período determinado"""
+        logger.info(f"🚀 Iniciando paper trading de {len(self.strategies)} estratégias por {duration_minutes} minutos...")
+        for bot in self.strategies:
+            logger.info(f"💰 [{bot.name}] Balance inicial: ${bot.balance:.2f}")
+
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        end_time = start_time + (duration_minutes * 60)
+
+        while loop.time() < end_time:
+            try:
+                found = await self.find_arbitrage_opportunities()
+
+                # Cada estratégia executa as próprias oportunidades com o próprio balance
+                await asyncio.gather(*(bot.process_opportunities(found[bot.name]) for bot in self.strategies))
+
+                # Aguardar antes da próxima análise
+                await asyncio.sleep(5)
+
+            except Exception as e:
+                logger.error(f"❌ Erro durante paper trading: {e}")
+                await asyncio.sleep(1)
+
+        # Relatório final por estratégia
+        total_time = (loop.time() - start_time) / 60
+        logger.info(f"📊 Paper Trading Finalizado! ({total_time:.1f} minutos, {self.fetches} buscas, "
+                    f"{self.deliveries} entregas às estratégias)")
+        summaries = self.summary()
+        for result in summaries:
+            logger.info(f"   [{result['strategy']}] 🎯 {result['opportunities_found']} oportunidades, "
+                        f"🚀 {result['trades_executed']} trades, 💵 lucro ${result['total_profit']:.2f}, "
+                        f"💰 balance ${result['balance']:.2f}")
+
+        return {
+            'duration_minutes': total_time,
+            'strategies': summaries
+        }
+
+    def summary(self) -> List[Dict]:
+        """Resultado de cada estratégia, na ordem configurada"""
+        return [bot.summary() for bot in self.strategies]
@@ -6,23 +6,56 @@ import asyncio
 import logging
 from typing import Optional
 
+import asyncpg
+
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, min_size: int = 1, max_size: int = 5):
         self.database_url = database_url
-        self.connection = None
-        
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool: Optional[asyncpg.Pool] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.pool is not None
+
     async def initialize(self):
         """Inicializar conexão com banco"""
         try:
-            # TODO: Implementar conexão real com PostgreSQL
-            logger.info("✅ Conexão com banco simulada (TODO: implementar)")
+            self.pool = await asyncpg.create_pool(
+                self.database_url,
+                min_size=self.min_size,
+                max_size=self.max_size
+            )
+            logger.info("✅ Pool de conexões PostgreSQL criado")
             return True
         except Exception as e:
             logger.error(f"❌ Erro ao conectar com banco: {e}")
+            self.pool = None
             return False
-    
+
+    async def fetch(self, query: str, *args):
+        """Executar consulta e retornar todas as linhas"""
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def execute(self, query: str, *args):
+        """Executar comando sem retorno de linhas"""
+        async with self.pool.acquire() as conn:
+            return await conn.execute(query, *args)
+
+    async def acquire(self) -> asyncpg.Connection:
+        """Reservar uma conexão dedicada (ex.: LISTEN); devolver com release()"""
+        return await self.pool.acquire()
+
+    async def release(self, conn: asyncpg.Connection):
+        await self.pool.release(conn)
+
     async def close(self):
         """Fechar conexão"""
         logger.info("Fechando conexão com banco...")
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
@@ -0,0 +1,217 @@
+"""
+Exportação incremental de histórico para Parquet (memória limitada a um lote)
+"""
+
+import json
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+_TIMESTAMP = pa.timestamp('us', tz='UTC')
+
+# tabela -> colunas (nome, tipo arrow); numéricos saem como float8
+EXPORT_TABLES: Dict[str, List[Tuple[str, pa.DataType]]] = {
+    'price_history': [
+        ('id', pa.int64()),
+        ('timestamp', _TIMESTAMP),
+        ('symbol', pa.string()),
+        ('exchange', pa.string()),
+        ('bid', pa.float64()),
+        ('ask', pa.float64()),
+        ('last', pa.float64()),
+        ('volume', pa.float64()),
+    ],
+    'arbitrage_opportunities': [
+        ('id', pa.int64()),
+        ('timestamp', _TIMESTAMP),
+        ('symbol', pa.string()),
+        ('buy_exchange', pa.string()),
+        ('sell_exchange', pa.string()),
+        ('buy_price', pa.float64()),
+        ('sell_price', pa.float64()),
+        ('profit_percent', pa.float64()),
+        ('trade_amount', pa.float64()),
+        ('executed', pa.bool_()),
+    ],
+    'trades_history': [
+        ('id', pa.int64()),
+        ('timestamp', _TIMESTAMP),
+        ('symbol', pa.string()),
+        ('buy_exchange', pa.string()),
+        ('sell_exchange', pa.string()),
+        ('quantity', pa.float64()),
+        ('buy_price', pa.float64()),
+        ('sell_price', pa.float64()),
+        ('trade_amount', pa.float64()),
+        ('gross_profit', pa.float64()),
+        ('total_fees', pa.float64()),
+        ('net_profit', pa.float64()),
+        ('profit_percent', pa.float64()),
+        ('status', pa.string()),
+    ],
+}
+
+WATERMARK_FILE = '_watermarks.json'
+
+# part-<primeiro id>-<último id>.parquet; gravado como .<nome>.tmp até o commit
+PART_PATTERN = re.compile(r'^\.?part-(\d+)-(\d+)\.parquet(\.tmp)?$')
+
+
+def _temp_name(run_name: str) -> str:
+    # prefixo '.': leitores de datasets (pyarrow, spark, duckdb) ignoram o arquivo
+    return f".{run_name}.tmp"
+
+
+def _select_sql(table: str) -> str:
+    columns = []
+    for name, dtype in EXPORT_TABLES[table]:
+        if name == 'id':
+            columns.append('id::int8 AS id')
+        elif name == 'timestamp':
+            columns.append("COALESCE(timestamp, created_at, 'epoch') AS timestamp")
+        elif dtype == pa.float64():
+            columns.append(f'{name}::float8 AS {name}')
+        else:
+            columns.append(name)
+    return f"SELECT {', '.join(columns)} FROM {table} WHERE (id > $1 AND id <= $2) OR id = ANY($3::int8[])"
+
+
+class ParquetExporter:
+    """
+    Exporta tabelas do PostgreSQL para `{output}/{tabela}/date=AAAA-MM-DD/*.parquet`.
+
+    As linhas são lidas com cursor no servidor em lotes de `chunk_size` e cada
+    lote vira um row group, então a memória usada não depende do tamanho da
+    tabela. O maior `id` exportado por tabela fica em `_watermarks.json`; a
+    próxima execução exporta apenas linhas novas, em arquivos novos.
+
+    Os arquivos de uma execução são gravados com nome temporário e renomeados
+    só quando a tabela termina; o watermark é salvo logo depois. Ao iniciar,
+    arquivos temporários e partes acima do watermark (execução interrompida)
+    são removidos, então uma nova execução não duplica linhas.
+
+    Ids vêm de uma sequence: uma linha com id menor que o watermark pode ser
+    confirmada depois do snapshot da exportação. Os ids ausentes entre os
+    últimos `gap_window` exportados ficam em `gaps` no watermark e são
+    buscados de novo nas execuções seguintes, até aparecerem ou saírem da janela.
+    """
+
+    def __init__(self, db_manager, output_dir: str, chunk_size: int = 50000, gap_window: int = 10000):
+        self.db_manager = db_manager
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.gap_window = gap_window
+        self.watermark_path = self.output_dir / WATERMARK_FILE
+
+    def load_watermarks(self) -> Dict[str, Dict]:
+        if not self.watermark_path.exists():
+            return {}
+        watermarks = json.loads(self.watermark_path.read_text())
+        # formato antigo: apenas o id por tabela
+        return {
+            table: mark if isinstance(mark, dict) else {'id': mark, 'gaps': []}
+            for table, mark in watermarks.items()
+        }
+
+    def _save_watermarks(self, watermarks: Dict[str, Dict]):
+        tmp = self.watermark_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(watermarks, indent=2, sort_keys=True))
+        tmp.replace(self.watermark_path)
+
+    async def export(self, tables: Optional[Iterable[str]] = None, full: bool = False) -> Dict[str, int]:
+        """Exportar tabelas; retorna o número de linhas exportadas por tabela"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        watermarks = self.load_watermarks()
+        exported = {}
+        for table in tables or EXPORT_TABLES:
+            if table not in EXPORT_TABLES:
+                raise ValueError(f"Tabela não exportável: {table}")
+            if full:
+                # zerar o watermark antes de apagar: uma falha no meio refaz tudo
+                watermarks.pop(table, None)
+                self._save_watermarks(watermarks)
+                shutil.rmtree(self.output_dir / table, ignore_errors=True)
+            mark = watermarks.get(table, {'id': 0, 'gaps': []})
+            self._remove_uncommitted(table, mark['id'])
+
+            rows, mark, parts = await self._export_table(table, mark)
+            exported[table] = rows
+            for temp, final in parts:
+                temp.replace(final)
+            watermarks[table] = mark
+            self._save_watermarks(watermarks)
+            logger.info(f"📦 {table}: {rows} linhas exportadas (watermark id={mark['id']}, "
+                        f"{len(mark['gaps'])} ids pendentes)")
+        return exported
+
+    def _remove_uncommitted(self, table: str, watermark: int):
+        """Apagar temporários e partes acima do watermark deixados por uma execução interrompida"""
+        for path in (self.output_dir / table).glob('date=*/*part-*'):
+            match = PART_PATTERN.match(path.name)
+            if match and (match.group(3) or int(match.group(1)) > watermark):
+                path.unlink()
+                logger.warning(f"🧹 Removido arquivo de exportação incompleta: {path}")
+
+    async def _export_table(self, table: str, mark: Dict) -> Tuple[int, Dict, List[Tuple[Path, Path]]]:
+        schema = pa.schema(EXPORT_TABLES[table])
+        since_id, gaps = mark['id'], mark['gaps']
+        writers: Dict[str, pq.ParquetWriter] = {}
+        paths: List[Tuple[Path, Path]] = []
+        total = 0
+
+        async with self.db_manager.pool.acquire() as conn:
+            async with conn.transaction(isolation='repeatable_read', readonly=True):
+                until_id = await conn.fetchval(f"SELECT COALESCE(MAX(id), 0)::int8 FROM {table}")
+                # ids pendentes só são relidos junto com linhas novas: o arquivo da
+                # execução sempre começa acima do watermark anterior
+                if until_id <= since_id:
+                    return 0, mark, []
+
+                # ids vistos na janela final, para achar os ausentes
+                window_start = until_id - self.gap_window
+                seen = set()
+                run_name = f"part-{since_id + 1}-{until_id}.parquet"
+                cursor = await conn.cursor(_select_sql(table), since_id, until_id, gaps)
+                try:
+                    while True:
+                        records = await cursor.fetch(self.chunk_size)
+                        if not records:
+                            break
+                        columns = list(zip(*records))
+                        seen.update(i for i in columns[0] if i > window_start)
+                        batch = pa.table(
+                            [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                            schema=schema
+                        )
+                        self._write_partitions(table, run_name, batch, writers, paths)
+                        total += len(records)
+                        del records, columns, batch
+                finally:
+                    for writer in writers.values():
+                        writer.close()
+
+        candidates = set(gaps) | set(range(max(since_id, window_start) + 1, until_id + 1))
+        pending = sorted(i for i in candidates if i > window_start and i not in seen)
+        return total, {'id': until_id, 'gaps': pending}, paths
+
+    def _write_partitions(self, table: str, run_name: str, batch: pa.Table,
+                          writers: Dict[str, pq.ParquetWriter], paths: List[Tuple[Path, Path]]):
+        dates = pc.cast(batch['timestamp'], pa.date32())
+        for day in pc.unique(dates).to_pylist():
+            part = batch.filter(pc.equal(dates, pa.scalar(day, pa.date32())))
+            key = day.isoformat()
+            writer = writers.get(key)
+            if writer is None:
+                directory = self.output_dir / table / f"date={key}"
+                directory.mkdir(parents=True, exist_ok=True)
+                paths.append((directory / _temp_name(run_name), directory / run_name))
+                writer = writers[key] = pq.ParquetWriter(paths[-1][0], batch.schema, compression='zstd')
+            writer.write_table(part)
@@ -0,0 +1,200 @@
+"""
+Persistência de market data, oportunidades e trades do ArbitrageX
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['timestamp', 'symbol', 'exchange', 'bid', 'ask', 'last', 'volume']
+
+ROLLUP_UPSERT_SQL = """
+INSERT INTO {table} AS r
+    (bucket, symbol, exchange, open, high, low, close, spread_min, spread_max, spread_sum, ticks)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+ON CONFLICT (symbol, exchange, bucket) DO UPDATE SET
+    high = GREATEST(r.high, EXCLUDED.high),
+    low = LEAST(r.low, EXCLUDED.low),
+    close = EXCLUDED.close,
+    spread_min = LEAST(r.spread_min, EXCLUDED.spread_min),
+    spread_max = GREATEST(r.spread_max, EXCLUDED.spread_max),
+    spread_sum = r.spread_sum + EXCLUDED.spread_sum,
+    ticks = r.ticks + EXCLUDED.ticks
+"""
+
+INSERT_OPPORTUNITY_SQL = """
+INSERT INTO arbitrage_opportunities
+    (timestamp, symbol, buy_exchange, sell_exchange, buy_price, sell_price, profit_percent, trade_amount, executed)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
+
+INSERT_TRADE_SQL = """
+INSERT INTO trades_history
+    (symbol, buy_exchange, sell_exchange, quantity, buy_price, sell_price, trade_amount,
+     gross_profit, total_fees, net_profit, profit_percent)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+"""
+
+UPDATE_STATS_TOTALS_SQL = """
+UPDATE trading_stats_totals SET
+    total_trades = total_trades + 1,
+    total_profit = total_profit + $1,
+    max_profit = GREATEST(max_profit, $1),
+    min_profit = LEAST(min_profit, $1),
+    sum_profit_percent = sum_profit_percent + $2,
+    updated_at = NOW()
+WHERE id = 1
+"""
+
+UPSERT_STATS_SYMBOL_SQL = """
+INSERT INTO trading_stats_symbols AS s (symbol, trades, net_profit) VALUES ($1, 1, $2)
+ON CONFLICT (symbol) DO UPDATE SET trades = s.trades + 1, net_profit = s.net_profit + EXCLUDED.net_profit
+"""
+
+UPSERT_STATS_EXCHANGE_SQL = """
+INSERT INTO trading_stats_exchanges AS e (exchange, trades) VALUES ($1, 1)
+ON CONFLICT (exchange) DO UPDATE SET trades = e.trades + 1
+"""
+
+
+def _utc(timestamp: datetime) -> datetime:
+    # RealTimePrice usa datetime.now() (horário local, sem tz)
+    return timestamp.astimezone(timezone.utc)
+
+
+def _aggregate(ticks: List[Tuple], resolution: str) -> List[Tuple]:
+    """Agregar ticks em barras OHLC (preço médio) e spread por bucket"""
+    bars: Dict[Tuple, list] = {}
+    for timestamp, symbol, exchange, bid, ask, _last, _volume in ticks:
+        if resolution == 'second':
+            bucket = timestamp.replace(microsecond=0)
+        else:
+            bucket = timestamp.replace(second=0, microsecond=0)
+        mid = (bid + ask) / 2
+        spread = ((ask - bid) / bid) * 100
+        bar = bars.get((symbol, exchange, bucket))
+        if bar is None:
+            bars[(symbol, exchange, bucket)] = [mid, mid, mid, mid, spread, spread, spread, 1]
+        else:
+            bar[1] = max(bar[1], mid)
+            bar[2] = min(bar[2], mid)
+            bar[3] = mid
+            bar[4] = min(bar[4], spread)
+            bar[5] = max(bar[5], spread)
+            bar[6] += spread
+            bar[7] += 1
+    return [(bucket, symbol, exchange, *bar) for (symbol, exchange, bucket), bar in bars.items()]
+
+
+class MarketDataStore:
+    """
+    Grava ticks, oportunidades e trades no PostgreSQL.
+
+    Ticks são acumulados em memória e descarregados a cada `flush_interval`
+    segundos: um COPY para `price_history` e um upsert por barra nos rollups
+    de 1s e 1m, na mesma transação. Cada trade atualiza também as tabelas de
+    estatísticas incrementais lidas pela view `trading_stats`.
+    """
+
+    def __init__(self, db_manager, flush_interval: float = 1.0, max_buffer: int = 100000):
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Tuple] = []
+        self._dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def record_prices(self, prices: Iterable):
+        """Enfileirar cotações (RealTimePrice) para gravação em lote"""
+        for price in prices:
+            if len(self._buffer) >= self.max_buffer:
+                self._dropped += 1
+                continue
+            self._buffer.append((
+                _utc(price.timestamp), price.symbol, price.exchange,
+                price.bid, price.ask, None, price.volume_24h
+            ))
+
+    async def flush(self):
+        """Gravar ticks pendentes e atualizar rollups"""
+        if not self._buffer:
+            return
+        ticks, self._buffer = self._buffer, []
+        if self._dropped:
+            logger.warning(f"⚠️ {self._dropped} ticks descartados (buffer cheio)")
+            self._dropped = 0
+
+        try:
+            async with self.db_manager.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.copy_records_to_table('price_history', records=ticks, columns=PRICE_COLUMNS)
+                    await conn.executemany(ROLLUP_UPSERT_SQL.format(table='price_rollup_1s'),
+                                           _aggregate(ticks, 'second'))
+                    await conn.executemany(ROLLUP_UPSERT_SQL.format(table='price_rollup_1m'),
+                                           _aggregate(ticks, 'minute'))
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar {len(ticks)} ticks: {e}")
+
+    async def record_opportunity(self, opportunity: Dict, executed: bool = False):
+        try:
+            await self.db_manager.execute(
+                INSERT_OPPORTUNITY_SQL,
+                _utc(opportunity['timestamp']),
+                opportunity['symbol'],
+                opportunity['buy_exchange'],
+                opportunity['sell_exchange'],
+                opportunity['buy_price'],
+                opportunity['sell_price'],
+                opportunity['profit_percent'],
+                opportunity.get('trade_amount'),
+                executed
+            )
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar oportunidade: {e}")
+
+    async def record_trade(self, trade: Dict):
+        """Gravar trade e atualizar estatísticas incrementais"""
+        net_profit = trade['gross_profit'] - trade.get('total_fees', 0.0)
+        try:
+            async with self.db_manager.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(
+                        INSERT_TRADE_SQL,
+                        trade['symbol'],
+                        trade['buy_exchange'],
+                        trade['sell_exchange'],
+                        trade['quantity'],
+                        trade['buy_price'],
+                        trade['sell_price'],
+                        trade['trade_amount'],
+                        trade['gross_profit'],
+                        trade.get('total_fees', 0.0),
+                        net_profit,
+                        trade['profit_percent']
+                    )
+                    await conn.execute(UPDATE_STATS_TOTALS_SQL, net_profit, trade['profit_percent'])
+                    await conn.execute(UPSERT_STATS_SYMBOL_SQL, trade['symbol'], net_profit)
+                    await conn.execute(UPSERT_STATS_EXCHANGE_SQL, trade['buy_exchange'])
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar trade: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,351 @@
+"""
+Gerenciamento de schema do ArbitrageX - partições diárias, retenção e rollups
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tabelas particionadas por dia -> coluna da chave de partição
+PARTITIONED_TABLES = {'price_history': 'timestamp', 'price_rollup_1s': 'bucket'}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS price_history (
+    id BIGSERIAL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    symbol VARCHAR(20) NOT NULL,
+    exchange VARCHAR(50) NOT NULL,
+    bid DECIMAL(20, 8),
+    ask DECIMAL(20, 8),
+    last DECIMAL(20, 8),
+    volume DECIMAL(20, 8),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+) PARTITION BY RANGE (timestamp);
+
+-- Recebe linhas fora das partições diárias (ex.: manutenção atrasada)
+CREATE TABLE IF NOT EXISTS price_history_default PARTITION OF price_history DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_price_history_timestamp_brin ON price_history USING BRIN (timestamp);
+
+CREATE TABLE IF NOT EXISTS price_rollup_1s (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    exchange VARCHAR(50) NOT NULL,
+    open DECIMAL(20, 8) NOT NULL,
+    high DECIMAL(20, 8) NOT NULL,
+    low DECIMAL(20, 8) NOT NULL,
+    close DECIMAL(20, 8) NOT NULL,
+    spread_min DECIMAL(10, 4) NOT NULL,
+    spread_max DECIMAL(10, 4) NOT NULL,
+    spread_sum DECIMAL(20, 8) NOT NULL,
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (symbol, exchange, bucket)
+) PARTITION BY RANGE (bucket);
+
+CREATE TABLE IF NOT EXISTS price_rollup_1s_default PARTITION OF price_rollup_1s DEFAULT;
+
+CREATE TABLE IF NOT EXISTS price_rollup_1m (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    exchange VARCHAR(50) NOT NULL,
+    open DECIMAL(20, 8) NOT NULL,
+    high DECIMAL(20, 8) NOT NULL,
+    low DECIMAL(20, 8) NOT NULL,
+    close DECIMAL(20, 8) NOT NULL,
+    spread_min DECIMAL(10, 4) NOT NULL,
+    spread_max DECIMAL(10, 4) NOT NULL,
+    spread_sum DECIMAL(20, 8) NOT NULL,
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (symbol, exchange, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_rollup_1m_bucket_brin ON price_rollup_1m USING BRIN (bucket);
+
+-- Tabelas gravadas pelo MarketDataStore e lidas pelo RuntimeConfigService:
+-- criadas aqui também para bancos iniciados sem o init.sql da raiz
+CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
+    id SERIAL PRIMARY KEY,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    symbol VARCHAR(20) NOT NULL,
+    buy_exchange VARCHAR(50) NOT NULL,
+    sell_exchange VARCHAR(50) NOT NULL,
+    buy_price DECIMAL(20, 8) NOT NULL,
+    sell_price DECIMAL(20, 8) NOT NULL,
+    profit_percent DECIMAL(10, 4) NOT NULL,
+    trade_amount DECIMAL(20, 8),
+    executed BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS trades_history (
+    id SERIAL PRIMARY KEY,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    symbol VARCHAR(20) NOT NULL,
+    buy_exchange VARCHAR(50) NOT NULL,
+    sell_exchange VARCHAR(50) NOT NULL,
+    quantity DECIMAL(20, 8) NOT NULL,
+    buy_price DECIMAL(20, 8) NOT NULL,
+    sell_price DECIMAL(20, 8) NOT NULL,
+    trade_amount DECIMAL(20, 8) NOT NULL,
+    gross_profit DECIMAL(20, 8),
+    total_fees DECIMAL(20, 8),
+    net_profit DECIMAL(20, 8),
+    profit_percent DECIMAL(10, 4),
+    status VARCHAR(20) DEFAULT 'completed',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_arbitrage_opportunities_timestamp ON arbitrage_opportunities(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_history_timestamp ON trades_history(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_history_symbol ON trades_history(symbol);
+
+CREATE TABLE IF NOT EXISTS bot_config (
+    id SERIAL PRIMARY KEY,
+    key VARCHAR(100) UNIQUE NOT NULL,
+    value TEXT,
+    description TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Só as flags: limites ausentes de bot_config seguem o ambiente/STRATEGIES_FILE
+INSERT INTO bot_config (key, value, description) VALUES
+('trading_enabled', 'true', 'Se o trading está habilitado'),
+('paper_trading', 'true', 'Se está em modo paper trading')
+ON CONFLICT (key) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION notify_bot_config_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('bot_config_changed', OLD.key);
+        RETURN OLD;
+    END IF;
+    NEW.updated_at := NOW();
+    PERFORM pg_notify('bot_config_changed', NEW.key);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bot_config_changed ON bot_config;
+CREATE TRIGGER trg_bot_config_changed
+    BEFORE INSERT OR UPDATE OR DELETE ON bot_config
+    FOR EACH ROW EXECUTE FUNCTION notify_bot_config_changed();
+
+CREATE TABLE IF NOT EXISTS trading_stats_totals (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_trades BIGINT NOT NULL DEFAULT 0,
+    total_profit DECIMAL(20, 8) NOT NULL DEFAULT 0,
+    max_profit DECIMAL(20, 8),
+    min_profit DECIMAL(20, 8),
+    sum_profit_percent DECIMAL(20, 4) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS trading_stats_symbols (
+    symbol VARCHAR(20) PRIMARY KEY,
+    trades BIGINT NOT NULL DEFAULT 0,
+    net_profit DECIMAL(20, 8) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS trading_stats_exchanges (
+    exchange VARCHAR(50) PRIMARY KEY,
+    trades BIGINT NOT NULL DEFAULT 0
+);
+
+DROP VIEW IF EXISTS trading_stats;
+CREATE VIEW trading_stats AS
+SELECT
+    t.total_trades,
+    t.total_profit,
+    t.total_profit / NULLIF(t.total_trades, 0) AS avg_profit,
+    t.max_profit,
+    t.min_profit,
+    t.sum_profit_percent / NULLIF(t.total_trades, 0) AS avg_profit_percent,
+    (SELECT COUNT(*) FROM trading_stats_symbols) AS symbols_traded,
+    (SELECT COUNT(*) FROM trading_stats_exchanges) AS exchanges_used
+FROM trading_stats_totals t
+WHERE t.id = 1;
+"""
+
+# Backfill único das tabelas de estatísticas a partir de trades_history,
+# executado apenas quando a linha de totais é criada (o INSERT ... SELECT de
+# agregados sempre produz a linha, mesmo sem trades)
+STATS_BACKFILL_SQL = """
+INSERT INTO trading_stats_totals (id, total_trades, total_profit, max_profit, min_profit, sum_profit_percent)
+SELECT 1, COUNT(*), COALESCE(SUM(net_profit), 0), MAX(net_profit), MIN(net_profit),
+       COALESCE(SUM(profit_percent), 0)
+FROM trades_history
+WHERE status = 'completed'
+ON CONFLICT (id) DO NOTHING
+RETURNING id
+"""
+
+STATS_SEED_SQL = "INSERT INTO trading_stats_totals (id) VALUES (1) ON CONFLICT (id) DO NOTHING"
+
+STATS_BACKFILL_DETAIL_SQL = """
+INSERT INTO trading_stats_symbols (symbol, trades, net_profit)
+SELECT symbol, COUNT(*), COALESCE(SUM(net_profit), 0)
+FROM trades_history WHERE status = 'completed' GROUP BY symbol
+ON CONFLICT (symbol) DO NOTHING;
+
+INSERT INTO trading_stats_exchanges (exchange, trades)
+SELECT buy_exchange, COUNT(*)
+FROM trades_history WHERE status = 'completed' GROUP BY buy_exchange
+ON CONFLICT (exchange) DO NOTHING;
+"""
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def default_partition(table: str) -> str:
+    return f"{table}_default"
+
+
+class SchemaManager:
+    """
+    Mantém o schema de séries temporais.
+
+    `price_history` e `price_rollup_1s` são particionadas por dia (UTC), com
+    partições criadas `premake_days` à frente e descartadas após
+    `retention_days`. Uma partição DEFAULT recebe as linhas sem partição
+    diária (manutenção atrasada ou falhando); ao criar a partição do dia, as
+    linhas desse dia são movidas da DEFAULT para ela. `trading_stats` lê tabelas de estatísticas incrementais
+    mantidas pelo MarketDataStore, então o custo não cresce com o histórico.
+    """
+
+    def __init__(self, db_manager, retention_days: int = 7, premake_days: int = 2,
+                 maintenance_interval: float = 3600.0):
+        self.db_manager = db_manager
+        self.retention_days = retention_days
+        self.premake_days = premake_days
+        self.maintenance_interval = maintenance_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Garantir schema, executar manutenção e agendá-la periodicamente"""
+        await self.ensure_schema()
+        await self.maintain()
+        self._task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_schema(self):
+        """Criar tabelas particionadas, rollups, trades, oportunidades, bot_config e estatísticas (idempotente)"""
+        async with self.db_manager.pool.acquire() as conn:
+            async with conn.transaction():
+                relkind = await conn.fetchval(
+                    "SELECT relkind::text FROM pg_class WHERE oid = to_regclass('price_history')"
+                )
+                if relkind == 'r':
+                    # price_history antiga, não particionada: preservar os dados
+                    await conn.execute("ALTER TABLE price_history RENAME TO price_history_legacy")
+                    logger.warning("⚠️ price_history não particionada renomeada para price_history_legacy")
+
+                await conn.execute(SCHEMA_SQL)
+                if await conn.fetchval(STATS_BACKFILL_SQL) is not None:
+                    await conn.execute(STATS_BACKFILL_DETAIL_SQL)
+                    logger.info("📊 Estatísticas incrementais inicializadas a partir de trades_history")
+                # a view lê a linha id = 1; os UPDATEs por trade dependem dela
+                await conn.execute(STATS_SEED_SQL)
+
+    async def maintain(self, today: Optional[date] = None):
+        """Criar partições futuras e descartar as expiradas"""
+        today = today or datetime.now(timezone.utc).date()
+        created = await self.ensure_partitions(today)
+        dropped = await self.drop_expired_partitions(today)
+        if created or dropped:
+            logger.info(f"🗂️  Partições criadas: {len(created)}, removidas: {len(dropped)}")
+
+    async def ensure_partitions(self, today: date) -> List[str]:
+        created = []
+        existing = set()
+        for table in PARTITIONED_TABLES:
+            existing.update(await self._partitions(table))
+
+        for table, column in PARTITIONED_TABLES.items():
+            days = {today + timedelta(days=offset) for offset in range(self.premake_days + 1)}
+            # dias que caíram na partição DEFAULT também ganham partição própria
+            days.update(await self._default_days(table, column))
+            for day in sorted(days):
+                name = partition_name(table, day)
+                if name in existing:
+                    continue
+                moved = await self._create_partition(table, column, name, day)
+                if moved:
+                    logger.warning(f"⚠️ {moved} linhas movidas de {default_partition(table)} para {name}")
+                created.append(name)
+        return created
+
+    async def _default_days(self, table: str, column: str) -> List[date]:
+        rows = await self.db_manager.fetch(
+            f"SELECT DISTINCT ({column} AT TIME ZONE 'UTC')::date AS day FROM {default_partition(table)}"
+        )
+        return [row['day'] for row in rows]
+
+    async def _create_partition(self, table: str, column: str, name: str, day: date) -> int:
+        """
+        Criar a partição de um dia movendo as linhas desse dia da partição
+        DEFAULT (o ATTACH falharia com elas lá). Retorna as linhas movidas.
+        """
+        start = f"'{day.isoformat()} 00:00:00+00'"
+        end = f"'{(day + timedelta(days=1)).isoformat()} 00:00:00+00'"
+        async with self.db_manager.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                status = await conn.execute(
+                    f"WITH moved AS (DELETE FROM {default_partition(table)} "
+                    f"WHERE {column} >= {start} AND {column} < {end} RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                )
+                await conn.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})")
+        return int(status.split()[-1])
+
+    async def drop_expired_partitions(self, today: date) -> List[str]:
+        cutoff = today - timedelta(days=self.retention_days)
+        dropped = []
+        for table, column in PARTITIONED_TABLES.items():
+            await self.db_manager.execute(
+                f"DELETE FROM {default_partition(table)} WHERE {column} < '{cutoff.isoformat()} 00:00:00+00'"
+            )
+            prefix = f"{table}_p"
+            for name in await self._partitions(table):
+                try:
+                    day = datetime.strptime(name[len(prefix):], '%Y%m%d').date()
+                except ValueError:
+                    continue
+                if day < cutoff:
+                    await self.db_manager.execute(f"DROP TABLE IF EXISTS {name}")
+                    dropped.append(name)
+        return dropped
+
+    async def _partitions(self, table: str) -> List[str]:
+        rows = await self.db_manager.fetch(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = $1
+            """,
+            table
+        )
+        return [row['relname'] for row in rows]
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"❌ Erro na manutenção de partições: {e}")
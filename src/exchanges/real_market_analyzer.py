@@ -4,15 +4,21 @@ Analisador de mercado real - Conexões com APIs das exchanges
 
 import asyncio
 import logging
-import aiohttp
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import json
 
+from exchanges.tick_buffer import TickStore
+from exchanges.venue_metadata import VenueMetadataCache
+
 logger = logging.getLogger(__name__)
 
+# intervalo mínimo entre tentativas de descoberta com o cache vencido
+# (evita refazer as listagens a cada ciclo quando as exchanges falham)
+METADATA_RETRY_SECONDS = 300
+
 @dataclass
 class RealTimePrice:
     symbol: str
@@ -32,17 +38,26 @@ class MarketDepth:
     timestamp: datetime
 
 class RealMarketAnalyzer:
-    def __init__(self, config):
+    def __init__(self, config, metrics=None):
         self.config = config
+        self.metrics = metrics
         self.session = None
-        self.price_cache = {}
+        # Ticks recentes por (symbol, exchange) em ring buffers
+        self.price_cache = TickStore(int(getattr(config, 'tick_buffer_size', 4096)))
         self.last_update = {}
+        # Chamado uma vez, na primeira cotação recebida (medição de cold start)
+        self.on_first_quote = None
+        self._metadata_task: Optional[asyncio.Task] = None
+        # símbolos já incluídos numa descoberta de pares e quando ela foi tentada
+        self._metadata_symbols = set()
+        self._metadata_attempted_at: Optional[float] = None
         
         # URLs das APIs públicas (sem necessidade de chaves)
         self.api_endpoints = {
             'binance': {
                 'ticker': 'https://api.binance.com/api/v3/ticker/24hr',
                 'orderbook': 'https://api.binance.com/api/v3/depth',
+                'ping': 'https://api.binance.com/api/v3/ping',
                 'symbols_map': {
                     'BTC/USDT': 'BTCUSDT',
                     'ETH/USDT': 'ETHUSDT',
@@ -53,6 +68,7 @@ class RealMarketAnalyzer:
             'coinbase': {
                 'ticker': 'https://api.exchange.coinbase.com/products/{}/ticker',
                 'orderbook': 'https://api.exchange.coinbase.com/products/{}/book',
+                'ping': 'https://api.exchange.coinbase.com/time',
                 'symbols_map': {
                     'BTC/USDT': 'BTC-USD',
                     'ETH/USDT': 'ETH-USD',
@@ -63,6 +79,7 @@ class RealMarketAnalyzer:
             'kraken': {
                 'ticker': 'https://api.kraken.com/0/public/Ticker',
                 'orderbook': 'https://api.kraken.com/0/public/Depth',
+                'ping': 'https://api.kraken.com/0/public/Time',
                 'symbols_map': {
                     'BTC/USDT': 'XBTUSD',
                     'ETH/USDT': 'ETHUSD',
@@ -71,18 +88,106 @@ class RealMarketAnalyzer:
                 }
             }
         }
+
+        # Pares do cache local (sem requisições na inicialização)
+        self.metadata = VenueMetadataCache(
+            getattr(config, 'venue_metadata_cache', 'data/venue_metadata.json'),
+            max_age=float(getattr(config, 'venue_metadata_max_age_hours', 24)) * 3600
+        )
+        self.metadata.apply(self.api_endpoints)
     
     async def initialize(self):
         """Inicializar conexões HTTP"""
+        if self.session is not None:
+            return True
+        # aiohttp (e o contexto SSL que ele carrega) só quando as conexões abrem
+        import aiohttp
+
         self.session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=10),
-            headers={'User-Agent': 'ArbitrageX/1.0'}
+            headers={'User-Agent': 'ArbitrageX/1.0'},
+            connector=aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
         )
         logger.info("🌐 Conexões HTTP inicializadas para análise real")
         return True
+
+    async def warm_up(self, symbols: Optional[List[str]] = None, timeout: float = 5.0) -> Dict[str, float]:
+        """
+        Abrir em paralelo uma conexão com cada exchange (DNS, TCP e TLS) antes
+        do primeiro ciclo; a conexão fica no pool para as cotações. Com
+        `symbols`, atualiza em segundo plano os metadados vencidos.
+        """
+        await self.initialize()
+
+        async def ping(exchange: str) -> float:
+            start = time.perf_counter()
+            async with self.session.get(self.api_endpoints[exchange]['ping']) as response:
+                await response.read()
+            return time.perf_counter() - start
+
+        exchanges = list(self.api_endpoints)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(ping(exchange), timeout) for exchange in exchanges), return_exceptions=True
+        )
+        timings = {}
+        for exchange, result in zip(exchanges, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"⚠️  Falha ao aquecer conexão com {exchange}: {result!r}")
+            else:
+                timings[exchange] = result
+        logger.info("🔥 Conexões aquecidas: " + ", ".join(f"{ex} {t * 1000:.0f}ms" for ex, t in timings.items()))
+
+        if symbols:
+            self.refresh_metadata(symbols)
+        return timings
+
+    def refresh_metadata(self, symbols: Iterable[str]) -> bool:
+        """
+        Refazer o mapeamento de pares em segundo plano quando o cache venceu ou
+        quando há símbolos novos sem par em alguma exchange (ex.: adicionados
+        em runtime por bot_config). Chamado a cada ciclo; retorna True se
+        iniciou uma descoberta.
+        """
+        if self.session is None or self._metadata_task is not None:
+            return False
+        symbols = list(dict.fromkeys(s.strip() for s in symbols if s.strip()))
+        unmapped = [
+            s for s in symbols
+            if s not in self._metadata_symbols
+            and any(s not in endpoints['symbols_map'] for endpoints in self.api_endpoints.values())
+        ]
+        now = time.monotonic()
+        retry = self.metadata.stale and (
+            self._metadata_attempted_at is None or now - self._metadata_attempted_at >= METADATA_RETRY_SECONDS
+        )
+        if not (unmapped or retry):
+            return False
+
+        if unmapped:
+            logger.info(f"🗂️  Buscando pares de {', '.join(unmapped)} nas exchanges")
+        self._metadata_symbols.update(symbols)
+        self._metadata_attempted_at = now
+        self._metadata_task = asyncio.create_task(
+            self.metadata.refresh(self.session, self.api_endpoints, symbols)
+        )
+        self._metadata_task.add_done_callback(self._metadata_done)
+        return True
+
+    def _metadata_done(self, task: asyncio.Task):
+        if self._metadata_task is task:
+            self._metadata_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Erro ao atualizar metadados de exchanges: {task.exception()}")
     
     async def close(self):
         """Fechar conexões"""
+        if self._metadata_task:
+            self._metadata_task.cancel()
+            try:
+                await self._metadata_task
+            except asyncio.CancelledError:
+                pass
+            self._metadata_task = None
         if self.session:
             await self.session.close()
     
@@ -179,12 +284,31 @@ class RealMarketAnalyzer:
             logger.error(f"❌ Erro ao buscar preço Kraken para {symbol}: {e}")
         return None
     
+    async def _fetch_with_metrics(self, exchange: str, fetch, symbol: str) -> Optional[RealTimePrice]:
+        """Executar busca de preço registrando latência, cotações e falhas"""
+        if self.metrics is None or symbol not in self.api_endpoints[exchange]['symbols_map']:
+            return await fetch(symbol)
+
+        venue_metrics = self.metrics.venue(symbol, exchange)
+        start = time.perf_counter()
+        try:
+            result = await fetch(symbol)
+        finally:
+            venue_metrics.fetch_latency.observe(time.perf_counter() - start)
+
+        if result is None:
+            venue_metrics.fetch_errors.inc()
+        else:
+            venue_metrics.quotes.inc()
+            venue_metrics.spread.set(result.spread_percent)
+        return result
+
     async def fetch_all_prices(self, symbol: str) -> Dict[str, RealTimePrice]:
         """Buscar preços de todas as exchanges para um símbolo"""
         tasks = [
-            self.fetch_binance_price(symbol),
-            self.fetch_coinbase_price(symbol),
-            self.fetch_kraken_price(symbol)
+            self._fetch_with_metrics('binance', self.fetch_binance_price, symbol),
+            self._fetch_with_metrics('coinbase', self.fetch_coinbase_price, symbol),
+            self._fetch_with_metrics('kraken', self.fetch_kraken_price, symbol)
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -193,8 +317,15 @@ class RealMarketAnalyzer:
         for result in results:
             if isinstance(result, RealTimePrice):
                 prices[result.exchange] = result
+                self.price_cache.record(result)
             elif isinstance(result, Exception):
                 logger.warning(f"⚠️  Erro ao buscar preço: {result}")
+
+        if prices:
+            self.last_update[symbol] = datetime.now()
+            if self.on_first_quote is not None:
+                callback, self.on_first_quote = self.on_first_quote, None
+                callback()
         
         return prices
     
@@ -0,0 +1,113 @@
+"""
+Ring buffers de ticks em memória por (symbol, exchange)
+"""
+
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# numpy é importado no primeiro buffer, fora do caminho da inicialização
+if TYPE_CHECKING:
+    import numpy as np
+
+FIELDS = ('timestamp', 'bid', 'ask', 'volume')
+
+
+class TickRingBuffer:
+    """Buffer circular de capacidade fixa em arrays numpy pré-alocados"""
+    __slots__ = ('capacity', 'timestamps', 'bids', 'asks', 'volumes', 'pos', 'count')
+
+    def __init__(self, capacity: int):
+        import numpy as np
+
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity)
+        self.bids = np.zeros(capacity)
+        self.asks = np.zeros(capacity)
+        self.volumes = np.zeros(capacity)
+        self.pos = 0
+        self.count = 0
+
+    def append(self, timestamp: float, bid: float, ask: float, volume: float):
+        pos = self.pos
+        self.timestamps[pos] = timestamp
+        self.bids[pos] = bid
+        self.asks[pos] = ask
+        self.volumes[pos] = volume
+        self.pos = (pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        if self.count == 0:
+            return None
+        last = self.pos - 1
+        return {
+            'timestamp': float(self.timestamps[last]),
+            'bid': float(self.bids[last]),
+            'ask': float(self.asks[last]),
+            'volume': float(self.volumes[last]),
+        }
+
+    def _ordered(self, array: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        if self.count < self.capacity:
+            return array[:self.count]
+        return np.concatenate((array[self.pos:], array[:self.pos]))
+
+    def window(self, since: float = 0.0) -> Dict[str, 'np.ndarray']:
+        """Ticks com timestamp >= since, em ordem cronológica (cópias)"""
+        import numpy as np
+
+        timestamps = self._ordered(self.timestamps)
+        start = int(np.searchsorted(timestamps, since, side='left'))
+        return {
+            'timestamp': timestamps[start:].copy(),
+            'bid': self._ordered(self.bids)[start:].copy(),
+            'ask': self._ordered(self.asks)[start:].copy(),
+            'volume': self._ordered(self.volumes)[start:].copy(),
+        }
+
+
+class TickStore:
+    """
+    Ticks recentes por (symbol, exchange).
+
+    Cada par tem um TickRingBuffer alocado no primeiro tick; depois disso
+    gravar um tick só escreve nos arrays existentes.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.buffers: Dict[Tuple[str, str], TickRingBuffer] = {}
+
+    def record(self, price) -> None:
+        """Gravar um RealTimePrice"""
+        key = (price.symbol, price.exchange)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = TickRingBuffer(self.capacity)
+        buffer.append(price.timestamp.timestamp(), price.bid, price.ask, price.volume_24h)
+
+    def symbols(self) -> List[str]:
+        return sorted({symbol for symbol, _ in self.buffers})
+
+    def latest_book(self, symbol: str) -> Dict[str, Dict[str, float]]:
+        """Última cotação de cada exchange para o símbolo"""
+        book = {}
+        for (buffer_symbol, exchange), buffer in self.buffers.items():
+            if buffer_symbol == symbol:
+                latest = buffer.latest()
+                if latest is not None:
+                    book[exchange] = latest
+        return book
+
+    def series(self, symbol: str, exchange: Optional[str] = None,
+               seconds: float = 300.0) -> Dict[str, Dict[str, 'np.ndarray']]:
+        """Ticks dos últimos `seconds` por exchange"""
+        since = time.time() - seconds
+        return {
+            buffer_exchange: buffer.window(since)
+            for (buffer_symbol, buffer_exchange), buffer in self.buffers.items()
+            if buffer_symbol == symbol and (exchange is None or buffer_exchange == exchange)
+        }
@@ -0,0 +1,155 @@
+"""
+Metadados de exchanges (mapeamento de pares) em cache local
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 2: Coinbase/Kraken preferem o par em USD (antes USDT vinha primeiro); caches
+# da versão anterior são descartados e refeitos em segundo plano
+CACHE_VERSION = 2
+
+# listagem de pares negociáveis por exchange
+DISCOVERY_URLS = {
+    'binance': 'https://api.binance.com/api/v3/exchangeInfo',
+    'coinbase': 'https://api.exchange.coinbase.com/products',
+    'kraken': 'https://api.kraken.com/0/public/AssetPairs',
+}
+
+# nomes de ativos que diferem do padrão BASE/QUOTE
+BASE_ALIASES = {'kraken': {'BTC': 'XBT'}}
+
+# campos de api_endpoints persistidos no cache: só o mapeamento descoberto;
+# os endpoints continuam vindo do código, para que um cache antigo não
+# mantenha URLs de outra versão
+CACHED_FIELDS = ('symbols_map',)
+
+
+def _quotes(exchange: str, quote: str):
+    # Coinbase e Kraken cotam os principais pares em USD: usar o par em USD,
+    # como no mapeamento padrão, e o par em USDT só quando não houver USD
+    if quote == 'USDT' and exchange != 'binance':
+        return ('USD', quote)
+    return (quote,)
+
+
+def discover_symbols(exchange: str, data, symbols: Iterable[str]) -> Dict[str, str]:
+    """Mapear símbolos BASE/QUOTE para o código do par na exchange a partir da listagem"""
+    pairs = {}
+    if exchange == 'binance':
+        for item in data.get('symbols', []):
+            if item.get('status') == 'TRADING':
+                pairs[(item['baseAsset'], item['quoteAsset'])] = item['symbol']
+    elif exchange == 'coinbase':
+        for item in data:
+            if not item.get('trading_disabled') and item.get('status', 'online') == 'online':
+                pairs[(item['base_currency'], item['quote_currency'])] = item['id']
+    elif exchange == 'kraken':
+        # a chave do par é o nome usado em `result` na resposta do Ticker
+        for name, item in data.get('result', {}).items():
+            if '/' in item.get('wsname', ''):
+                base, quote = item['wsname'].split('/')
+                pairs[(base, quote)] = name
+
+    aliases = BASE_ALIASES.get(exchange, {})
+    mapped = {}
+    for symbol in symbols:
+        base, _, quote = symbol.strip().partition('/')
+        for candidate in _quotes(exchange, quote):
+            code = pairs.get((aliases.get(base, base), candidate))
+            if code:
+                mapped[symbol.strip()] = code
+                break
+    return mapped
+
+
+class VenueMetadataCache:
+    """
+    Guarda em disco o mapeamento de pares de cada exchange.
+
+    Na inicialização o cache é aplicado sobre `api_endpoints` sem nenhuma
+    requisição; quando está ausente ou mais velho que `max_age`, é refeito
+    em segundo plano a partir das listagens de pares das exchanges, sem
+    atrasar o primeiro ciclo.
+    """
+
+    def __init__(self, path: str, max_age: float = 24 * 3600):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.updated_at: Optional[float] = None
+
+    @property
+    def stale(self) -> bool:
+        return self.updated_at is None or time.time() - self.updated_at > self.max_age
+
+    def apply(self, api_endpoints: Dict) -> bool:
+        """Aplicar o cache em disco sobre api_endpoints; False se não houver cache válido"""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Cache de metadados inválido ({self.path}): {e}")
+            return False
+        if data.get('version') != CACHE_VERSION:
+            return False
+
+        for exchange, meta in data.get('venues', {}).items():
+            endpoints = api_endpoints.get(exchange)
+            if endpoints is None:
+                continue
+            endpoints['symbols_map'].update(meta.get('symbols_map', {}))
+        self.updated_at = data.get('updated_at')
+        return True
+
+    def save(self, api_endpoints: Dict):
+        data = {
+            'version': CACHE_VERSION,
+            'updated_at': time.time(),
+            'venues': {
+                exchange: {key: endpoints[key] for key in CACHED_FIELDS if key in endpoints}
+                for exchange, endpoints in api_endpoints.items()
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+        tmp.replace(self.path)
+        self.updated_at = data['updated_at']
+
+    async def refresh(self, session, api_endpoints: Dict, symbols: Iterable[str]):
+        """Refazer o mapeamento dos símbolos a partir das listagens das exchanges e salvar"""
+        symbols = list(symbols)
+
+        async def discover(exchange: str):
+            async with session.get(DISCOVERY_URLS[exchange]) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status}")
+                return discover_symbols(exchange, await response.json(), symbols)
+
+        exchanges = [exchange for exchange in api_endpoints if exchange in DISCOVERY_URLS]
+        results = await asyncio.gather(*(discover(exchange) for exchange in exchanges), return_exceptions=True)
+        refreshed = 0
+        for exchange, result in zip(exchanges, results):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Falha ao listar pares da {exchange}: {result}")
+                continue
+            refreshed += 1
+            api_endpoints[exchange]['symbols_map'].update(result)
+            missing = [s for s in symbols if s.strip() not in api_endpoints[exchange]['symbols_map']]
+            if missing:
+                logger.info(f"ℹ️  {exchange}: sem par para {', '.join(missing)}")
+
+        if not refreshed:
+            return
+        try:
+            self.save(api_endpoints)
+            logger.info(f"🗂️  Metadados de exchanges salvos em {self.path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao salvar metadados de exchanges: {e}")
@@ -4,6 +4,11 @@ ArbitrageX - Advanced Cryptocurrency Arbitrage Trading Bot
 Main entry point for the application
 """
 
+import time
+
+# Início do processo para o tempo de inicialização (antes dos imports pesados)
+PROCESS_START = time.monotonic()
+
 import asyncio
 import argparse
 import logging
@@ -14,57 +19,234 @@ from pathlib import Path
 # Adicionar src ao path
 sys.path.append(str(Path(__file__).parent))
 
-from bot.arbitrage_bot import ArbitrageBot
-from utils.config import Config
+# Módulos opcionais (banco, diagnóstico, notificações, API de consulta) são
+# importados apenas quando usados. aiohttp é importado ao abrir as conexões;
+# prometheus_client e numpy (métricas e bot) depois que as conexões com as
+# exchanges já estão em andamento, sobrepondo o import à latência da rede.
+from exchanges.real_market_analyzer import RealMarketAnalyzer
+from utils.config import Config, load_environment
 from utils.logger import setup_logging
-from database.connection import DatabaseManager
-from monitoring.metrics import MetricsCollector
+from utils.runtime_config import RuntimeConfigService
+from utils.startup import StartupTimer
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
 class ArbitrageXApp:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, started_at: float = PROCESS_START):
+        self.startup = StartupTimer(started_at)
+        self.startup.phases['imports'] = self.startup.elapsed()
+        with self.startup.phase('config'):
+            self.config = Config()
         self.bot = None
+        self.strategy_configs = []
+        self.strategy_runtime = None
+        self.market_analyzer = None
         self.db_manager = None
+        self.runtime_config = None
+        self.schema = None
+        self.market_store = None
         self.metrics = None
+        self.diagnostics = None
+        self.notifier = None
+        self.query_api = None
         self.running = False
+
+    async def _warm_up_connections(self):
+        with self.startup.phase('connections'):
+            symbols = list(self.config.trading_symbols)
+            for _, config in self.strategy_configs:
+                symbols.extend(config.trading_symbols)
+            await self.market_analyzer.warm_up(list(dict.fromkeys(s.strip() for s in symbols)))
         
     async def initialize(self):
         """Inicializar todos os componentes"""
+        warm_up = None
         try:
             # Setup logging
-            setup_logging(self.config.log_level)
+            with self.startup.phase('logging'):
+                setup_logging(self.config.log_level)
             logger.info("🚀 Iniciando ArbitrageX...")
+
+            # Analyzer primeiro: as conexões com as exchanges abrem em paralelo
+            # com o banco e o restante da inicialização (métricas são ligadas depois)
+            with self.startup.phase('metadata'):
+                self.market_analyzer = RealMarketAnalyzer(self.config)
+                # Estratégias adicionais compartilham o mesmo analyzer
+                if self.config.strategies_file:
+                    from bot.strategy_runtime import load_strategies
+
+                    self.strategy_configs = load_strategies(self.config)
+            self.market_analyzer.on_first_quote = self.startup.mark_first_quote
+            warm_up = asyncio.create_task(self._warm_up_connections())
             
             # Inicializar database
-            self.db_manager = DatabaseManager(self.config.database_url)
-            await self.db_manager.initialize()
-            logger.info("✅ Database conectado")
+            with self.startup.phase('database'):
+                from database.connection import DatabaseManager
+
+                self.db_manager = DatabaseManager(self.config.database_url)
+                if await self.db_manager.initialize():
+                    logger.info("✅ Database conectado")
+                else:
+                    logger.warning("⚠️  Database indisponível, seguindo sem persistência")
+
+                # Partições, retenção e rollups de séries temporais
+                if self.db_manager.connected:
+                    from database.market_store import MarketDataStore
+                    from database.schema import SchemaManager
+
+                    self.schema = SchemaManager(self.db_manager, retention_days=self.config.price_retention_days)
+                    await self.schema.start()
+                    self.market_store = MarketDataStore(self.db_manager, flush_interval=self.config.tick_flush_interval)
+                    await self.market_store.start()
+
+            # Configuração recarregável (bot_config)
+            with self.startup.phase('runtime_config'):
+                self.runtime_config = RuntimeConfigService(
+                    self.config,
+                    db_manager=self.db_manager,
+                    poll_interval=self.config.config_poll_interval
+                )
+                await self.runtime_config.start()
             
             # Inicializar métricas
-            self.metrics = MetricsCollector()
-            await self.metrics.start()
+            with self.startup.phase('metrics'):
+                from monitoring.metrics import DEFAULT_STRATEGY, MetricsCollector
+
+                self.metrics = MetricsCollector(port=self.config.prometheus_port)
+                self.market_analyzer.metrics = self.metrics
+                # com várias estratégias cada uma vincula os próprios labels
+                self.metrics.bind(self.runtime_config.snapshot.trading_symbols, self.config.exchanges.keys(),
+                                  strategy=None if self.strategy_configs else DEFAULT_STRATEGY)
+                await self.metrics.start()
             logger.info("✅ Métricas iniciadas")
+
+            with self.startup.phase('services'):
+                # Diagnóstico de runtime (desligado por padrão)
+                if self.config.diagnostics_enabled:
+                    from monitoring.diagnostics import RuntimeDiagnostics
+
+                    self.diagnostics = RuntimeDiagnostics(
+                        port=self.config.diagnostics_port,
+                        host=self.config.diagnostics_host,
+                        slow_callback_seconds=self.config.slow_callback_ms / 1000,
+                        registry=self.metrics.registry
+                    )
+                    await self.diagnostics.start()
+
+                # Alertas Telegram/Discord (apenas canais configurados)
+                if self.config.telegram_bot_token or self.config.discord_webhook_url:
+                    from monitoring.notifications import NotificationDispatcher
+
+                    self.notifier = NotificationDispatcher.from_config(self.config, metrics=self.metrics)
+                    if self.notifier:
+                        await self.notifier.start()
             
             # Inicializar bot
-            self.bot = ArbitrageBot(
-                config=self.config,
-                db_manager=self.db_manager,
-                metrics=self.metrics
-            )
+            with self.startup.phase('bot'):
+                from bot.arbitrage_bot import ArbitrageBot
+
+                if self.strategy_configs:
+                    from bot.strategy_runtime import StrategyRuntime
+
+                    # A primeira estratégia é a principal (persistência, alertas, bot_config)
+                    self.strategy_runtime = StrategyRuntime(
+                        self.strategy_configs,
+                        self.market_analyzer,
+                        self.metrics,
+                        db_manager=self.db_manager,
+                        runtime_config=self.runtime_config,
+                        market_store=self.market_store,
+                        notifier=self.notifier
+                    )
+                    self.bot = self.strategy_runtime.primary
+                else:
+                    self.bot = ArbitrageBot(
+                        config=self.config,
+                        db_manager=self.db_manager,
+                        metrics=self.metrics,
+                        runtime_config=self.runtime_config,
+                        market_store=self.market_store,
+                        notifier=self.notifier,
+                        market_analyzer=self.market_analyzer
+                    )
+            with self.startup.phase('connections_wait'):
+                await warm_up
             await self.bot.initialize()
             logger.info("✅ Bot inicializado")
-            
+
+            # API local de consulta (book, séries recentes, oportunidades)
+            if self.config.query_api_enabled:
+                with self.startup.phase('query_api'):
+                    from monitoring.query_api import QueryAPI
+
+                    self.query_api = QueryAPI(
+                        self.bot.market_analyzer.price_cache,
+                        self.bot.opportunity_cache,
+                        port=self.config.query_api_port,
+                        host=self.config.query_api_host,
+                        strategies=self.strategy_runtime.strategies if self.strategy_runtime else [self.bot]
+                    )
+                    await self.query_api.start()
+
+            self.startup.report(self.metrics)
             return True
             
         except Exception as e:
             logger.error(f"❌ Erro na inicialização: {e}")
+            if warm_up and not warm_up.done():
+                warm_up.cancel()
             return False
     
+    async def maintain_database(self):
+        """Criar/atualizar schema e aplicar retenção de partições"""
+        from database.connection import DatabaseManager
+        from database.schema import SchemaManager
+
+        setup_logging(self.config.log_level)
+        self.db_manager = DatabaseManager(self.config.database_url)
+        if not await self.db_manager.initialize():
+            return False
+        try:
+            schema = SchemaManager(self.db_manager, retention_days=self.config.price_retention_days)
+            await schema.ensure_schema()
+            await schema.maintain()
+            logger.info("✅ Manutenção do banco concluída")
+            return True
+        finally:
+            await self.db_manager.close()
+
+    async def export_data(self, output_dir, tables=None, chunk_size=50000, full=False):
+        """Exportar histórico do banco para Parquet"""
+        from database.connection import DatabaseManager
+        from database.export import ParquetExporter
+
+        setup_logging(self.config.log_level)
+        self.db_manager = DatabaseManager(self.config.database_url)
+        if not await self.db_manager.initialize():
+            return False
+        try:
+            exporter = ParquetExporter(self.db_manager, output_dir, chunk_size=chunk_size)
+            await exporter.export(tables, full=full)
+            logger.info(f"✅ Exportação concluída em {output_dir}")
+            return True
+        finally:
+            await self.db_manager.close()
+
     async def run(self, mode='paper', duration=None):
         """Executar o bot"""
+        if mode == 'maintain-db':
+            return await self.maintain_database()
+
+        if mode == 'live':
+            # Não há execução real de ordens: recusar antes de iniciar qualquer componente
+            # (em vez de rodar só parte das estratégias ou cair em paper trading)
+            setup_logging(self.config.log_level)
+            logger.error("❌ Live trading ainda não está implementado; use --mode paper")
+            if self.config.strategies_file:
+                logger.error(f"❌ As estratégias de {self.config.strategies_file} rodam apenas em --mode paper")
+            return False
+
         if not await self.initialize():
             return False
             
@@ -73,10 +255,10 @@ class ArbitrageXApp:
         try:
             if mode == 'paper':
                 logger.info("📝 Iniciando Paper Trading...")
-                await self.bot.run_paper_trading(duration or 60)
-            elif mode == 'live':
-                logger.warning("⚠️  Iniciando Live Trading - DINHEIRO REAL!")
-                await self.bot.run_live_trading()
+                if self.strategy_runtime:
+                    await self.strategy_runtime.run_paper_trading(duration or 60)
+                else:
+                    await self.bot.run_paper_trading(duration or 60)
             else:
                 logger.error(f"❌ Modo inválido: {mode}")
                 return False
@@ -93,9 +275,29 @@ class ArbitrageXApp:
         logger.info("🛑 Fazendo shutdown...")
         self.running = False
         
+        if self.query_api:
+            await self.query_api.stop()
+
         if self.bot:
             await self.bot.shutdown()
+        elif self.market_analyzer:
+            await self.market_analyzer.close()
         
+        if self.notifier:
+            await self.notifier.stop()
+
+        if self.runtime_config:
+            await self.runtime_config.stop()
+
+        if self.market_store:
+            await self.market_store.stop()
+
+        if self.schema:
+            await self.schema.stop()
+
+        if self.diagnostics:
+            await self.diagnostics.stop()
+
         if self.metrics:
             await self.metrics.stop()
             
@@ -112,15 +314,26 @@ def signal_handler(signum, frame):
 def main():
     """Função principal"""
     parser = argparse.ArgumentParser(description='ArbitrageX - Crypto Arbitrage Bot')
-    parser.add_argument('--mode', choices=['paper', 'live'], default='paper',
+    parser.add_argument('--mode', choices=['paper', 'live', 'maintain-db', 'export'], default='paper',
                        help='Modo de execução (default: paper)')
     parser.add_argument('--duration', type=int, default=60,
                        help='Duração em minutos para paper trading (default: 60)')
     parser.add_argument('--config', type=str, default='.env',
                        help='Arquivo de configuração (default: .env)')
+    parser.add_argument('--output', type=str, default='data/export',
+                       help='Diretório de saída do modo export (default: data/export)')
+    parser.add_argument('--tables', type=str, default=None,
+                       help='Tabelas a exportar, separadas por vírgula (default: todas)')
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                       help='Linhas por lote no modo export (default: 50000)')
+    parser.add_argument('--full', action='store_true',
+                       help='Ignorar watermark e exportar todo o histórico')
     
     args = parser.parse_args()
     
+    # Variáveis do arquivo indicado em --config (antes de criar o Config)
+    load_environment(args.config)
+
     # Configurar handlers de sinal
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -129,7 +342,12 @@ def main():
     app = ArbitrageXApp()
     
     try:
-        asyncio.run(app.run(mode=args.mode, duration=args.duration))
+        if args.mode == 'export':
+            tables = args.tables.split(',') if args.tables else None
+            if not asyncio.run(app.export_data(args.output, tables, args.chunk_size, args.full)):
+                sys.exit(1)
+        elif asyncio.run(app.run(mode=args.mode, duration=args.duration)) is False:
+            sys.exit(1)
     except KeyboardInterrupt:
         print("\n👋 ArbitrageX finalizado pelo usuário")
     except Exception as e:
@@ -0,0 +1,195 @@
+"""
+Diagnóstico de runtime do ArbitrageX - lag do event loop, callbacks lentos e profiler por amostragem
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import Counter as CallCounter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from prometheus_client import Counter, Histogram, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Limite de locais distintos com label próprio; o restante vai para "other"
+MAX_SLOW_LOCATIONS = 50
+MAX_PROFILE_SECONDS = 60.0
+
+
+def _callback_location(handle: asyncio.Handle) -> str:
+    """Descrever a origem de um callback (corrotina da Task ou função)"""
+    callback = handle._callback
+    owner = getattr(callback, '__self__', None)
+    if isinstance(owner, asyncio.Task):
+        code = getattr(owner.get_coro(), 'cr_code', None)
+    else:
+        code = getattr(callback, '__code__', None)
+    if code is None:
+        return getattr(callback, '__qualname__', type(callback).__name__)
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RuntimeDiagnostics:
+    """
+    Instrumentação do event loop, desligada por padrão.
+
+    - lag: uma task dorme `interval` e mede o atraso para acordar;
+    - callbacks lentos: `asyncio.Handle._run` é envolvido para cronometrar
+      cada callback e contar os que passam de `slow_callback_seconds`;
+    - /debug/profile?seconds=N: amostra a pilha da thread do loop e retorna
+      stacks colapsadas (formato aceito por flamegraph.pl / speedscope).
+    """
+
+    def __init__(self, port: int = 8001, interval: float = 0.1, slow_callback_seconds: float = 0.1,
+                 registry=REGISTRY, host: str = '127.0.0.1'):
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self.slow_callback_seconds = slow_callback_seconds
+
+        self.loop_lag = Histogram('arbitragex_event_loop_lag_seconds', 'Atraso do event loop',
+                                  buckets=LAG_BUCKETS, registry=registry)
+        self.slow_callbacks = Counter('arbitragex_slow_callbacks_total', 'Callbacks acima do limite de duração',
+                                      ['location'], registry=registry)
+
+        self.slow_counts: Dict[str, int] = {}
+        self._slow_children = {}
+        self._loop_thread_id: Optional[int] = None
+        self._original_run = None
+        self._task: Optional[asyncio.Task] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._profile_lock = threading.Lock()
+
+    async def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._patch_handles()
+        self._task = asyncio.create_task(self._measure_lag())
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+            threading.Thread(target=self._server.serve_forever, daemon=True,
+                             name='arbitragex-diagnostics').start()
+            logger.info(f"🩺 Diagnóstico de runtime em http://{self.host}:{self.port}/debug")
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao iniciar servidor de diagnóstico: {e}")
+            self._server = None
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._original_run is not None:
+            asyncio.Handle._run = self._original_run
+            self._original_run = None
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        observe = self.loop_lag.observe
+        interval = self.interval
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            observe(max(0.0, loop.time() - expected))
+
+    def _patch_handles(self):
+        original_run = self._original_run = asyncio.Handle._run
+        threshold = self.slow_callback_seconds
+        record = self._record_slow
+        perf_counter = time.perf_counter
+
+        def _run(handle):
+            start = perf_counter()
+            original_run(handle)
+            elapsed = perf_counter() - start
+            if elapsed >= threshold:
+                record(handle, elapsed)
+
+        asyncio.Handle._run = _run
+
+    def _record_slow(self, handle: asyncio.Handle, elapsed: float):
+        location = _callback_location(handle)
+        if location not in self.slow_counts and len(self.slow_counts) >= MAX_SLOW_LOCATIONS:
+            location = 'other'
+        self.slow_counts[location] = self.slow_counts.get(location, 0) + 1
+
+        child = self._slow_children.get(location)
+        if child is None:
+            child = self._slow_children[location] = self.slow_callbacks.labels(location)
+        child.inc()
+        logger.debug(f"🐢 Callback lento ({elapsed * 1000:.1f}ms): {location}")
+
+    def sample_profile(self, seconds: float, interval: float = 0.005) -> str:
+        """Amostrar a pilha da thread do loop e retornar stacks colapsadas"""
+        stacks = CallCounter()
+        deadline = time.monotonic() + seconds
+        thread_id = self._loop_thread_id
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if names:
+                stacks[';'.join(reversed(names))] += 1
+            time.sleep(interval)
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def _make_handler(self):
+        diagnostics = self
+
+        class DiagnosticsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path == '/debug/profile':
+                    self._profile(params)
+                elif url.path in ('/debug', '/debug/slow'):
+                    body = json.dumps({'slow_callbacks': diagnostics.slow_counts}, indent=2)
+                    self._reply(200, 'application/json', body)
+                else:
+                    self._reply(404, 'text/plain', 'not found\n')
+
+            def _profile(self, params):
+                try:
+                    seconds = min(float(params.get('seconds', ['10'])[0]), MAX_PROFILE_SECONDS)
+                    interval = max(float(params.get('interval', ['0.005'])[0]), 0.001)
+                except ValueError:
+                    self._reply(400, 'text/plain', 'invalid seconds/interval\n')
+                    return
+                if not diagnostics._profile_lock.acquire(blocking=False):
+                    self._reply(409, 'text/plain', 'profile already running\n')
+                    return
+                try:
+                    body = diagnostics.sample_profile(seconds, interval)
+                finally:
+                    diagnostics._profile_lock.release()
+                self._reply(200, 'text/plain', body)
+
+            def _reply(self, status: int, content_type: str, body: str):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(f"diagnostics: {format % args}")
+
+        return DiagnosticsHandler
@@ -2,35 +2,261 @@
 Sistema de métricas do ArbitrageX
 """
 
+import os
 import asyncio
 import logging
-from prometheus_client import Counter, Histogram, Gauge, start_http_server
+from typing import Dict, Iterable, Optional, Tuple
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, Gauge, REGISTRY, multiprocess, start_http_server
+)
 
 logger = logging.getLogger(__name__)
 
+# Estratégia usada quando o processo roda um único ArbitrageBot
+DEFAULT_STRATEGY = 'default'
+
+# Buckets de latência das APIs das exchanges (segundos)
+FETCH_LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets de latência de envio de notificações (segundos)
+NOTIFICATION_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class VenueMetrics:
+    """Filhos pré-vinculados para um par (symbol, exchange)"""
+    __slots__ = ('quotes', 'fetch_errors', 'fetch_latency', 'spread')
+
+    def __init__(self, collector: 'MetricsCollector', symbol: str, exchange: str):
+        self.quotes = collector.quotes_total.labels(symbol, exchange)
+        self.fetch_errors = collector.fetch_errors_total.labels(symbol, exchange)
+        self.fetch_latency = collector.fetch_latency.labels(symbol, exchange)
+        self.spread = collector.quote_spread.labels(symbol, exchange)
+
+
+class RouteMetrics:
+    """Filhos pré-vinculados para uma rota (symbol, buy_exchange, sell_exchange) de uma estratégia"""
+    __slots__ = ('opportunities', 'spread')
+
+    def __init__(self, collector: 'MetricsCollector', strategy: str, symbol: str,
+                 buy_exchange: str, sell_exchange: str):
+        self.opportunities = collector.opportunities_found.labels(strategy, symbol, buy_exchange, sell_exchange)
+        # o spread entre exchanges é do mercado, igual para todas as estratégias
+        self.spread = collector.route_spread.labels(symbol, buy_exchange, sell_exchange)
+
+
+class SymbolMetrics:
+    """Filhos pré-vinculados para um símbolo de uma estratégia"""
+    __slots__ = ('trades', 'profit')
+
+    def __init__(self, collector: 'MetricsCollector', strategy: str, symbol: str):
+        self.trades = collector.trades_total.labels(strategy, symbol)
+        self.profit = collector.profit_total.labels(strategy, symbol)
+
+
+class ChannelMetrics:
+    """Filhos pré-vinculados para um canal de notificação"""
+    __slots__ = ('queue_depth', 'send_latency', 'sent', 'rate_limited', 'failed', 'coalesced', 'dropped')
+
+    def __init__(self, collector: 'MetricsCollector', channel: str):
+        self.queue_depth = collector.notification_queue_depth.labels(channel)
+        self.send_latency = collector.notification_send_latency.labels(channel)
+        self.sent = collector.notifications_sent_total.labels(channel, 'ok')
+        self.rate_limited = collector.notifications_sent_total.labels(channel, 'rate_limited')
+        self.failed = collector.notifications_sent_total.labels(channel, 'error')
+        self.coalesced = collector.notification_alerts_total.labels(channel, 'coalesced')
+        self.dropped = collector.notification_alerts_total.labels(channel, 'dropped')
+
+
+class StrategyMetrics:
+    """
+    Métricas de uma estratégia (label `strategy`) com a interface usada pelo
+    ArbitrageBot. Market data e notificações são do processo e continuam no
+    MetricsCollector.
+    """
+
+    def __init__(self, collector: 'MetricsCollector', strategy: str):
+        self.collector = collector
+        self.strategy = strategy
+        self.balance_gauge = collector.balance.labels(strategy)
+        self.trade_duration = collector.trade_duration_seconds.labels(strategy)
+        self._routes: Dict[Tuple[str, str, str], RouteMetrics] = {}
+        self._symbols: Dict[str, SymbolMetrics] = {}
+
+    def bind(self, symbols: Iterable[str], exchanges: Iterable[str]):
+        exchanges = list(exchanges)
+        for symbol in symbols:
+            symbol = symbol.strip()
+            self.symbol(symbol)
+            for exchange in exchanges:
+                for other in exchanges:
+                    if other != exchange:
+                        self.route(symbol, exchange, other)
+
+    def route(self, symbol: str, buy_exchange: str, sell_exchange: str) -> RouteMetrics:
+        metrics = self._routes.get((symbol, buy_exchange, sell_exchange))
+        if metrics is None:
+            metrics = RouteMetrics(self.collector, self.strategy, symbol, buy_exchange, sell_exchange)
+            self._routes[(symbol, buy_exchange, sell_exchange)] = metrics
+        return metrics
+
+    def symbol(self, symbol: str) -> SymbolMetrics:
+        metrics = self._symbols.get(symbol)
+        if metrics is None:
+            metrics = self._symbols[symbol] = SymbolMetrics(self.collector, self.strategy, symbol)
+        return metrics
+
+    def venue(self, symbol: str, exchange: str) -> VenueMetrics:
+        return self.collector.venue(symbol, exchange)
+
+    def channel(self, channel: str) -> ChannelMetrics:
+        return self.collector.channel(channel)
+
+
 class MetricsCollector:
-    def __init__(self):
+    """
+    Métricas Prometheus do ArbitrageX.
+
+    Os filhos com labels são criados uma vez em `bind()` e guardados em
+    dicionários; no hot path basta `collector.venue(symbol, exchange)` e uma
+    chamada a inc/set/observe, sem resolver labels a cada tick. Quando
+    PROMETHEUS_MULTIPROC_DIR está definido, o servidor HTTP agrega os valores
+    de todos os processos via MultiProcessCollector.
+
+    Trades, lucro, oportunidades e balance têm o label `strategy`;
+    `collector.strategy(nome)` devolve a visão de uma estratégia e os
+    atalhos do próprio coletor usam a estratégia `default`.
+    """
+
+    def __init__(self, port: int = 8000, registry: CollectorRegistry = REGISTRY):
+        self.port = port
+        self.registry = registry
+        self.multiprocess_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+        self._server_started = False
+
         # Métricas Prometheus
-        self.trades_total = Counter('arbitragex_trades_total', 'Total de trades executados')
-        self.profit_total = Counter('arbitragex_profit_total', 'Lucro total acumulado')
-        self.opportunities_found = Counter('arbitragex_opportunities_total', 'Oportunidades encontradas')
-        self.trade_duration = Histogram('arbitragex_trade_duration_seconds', 'Duração dos trades')
-        self.balance_gauge = Gauge('arbitragex_balance', 'Balance atual')
-        
+        self.trades_total = Counter('arbitragex_trades_total', 'Total de trades executados',
+                                    ['strategy', 'symbol'], registry=registry)
+        self.profit_total = Counter('arbitragex_profit_total', 'Lucro total acumulado',
+                                    ['strategy', 'symbol'], registry=registry)
+        self.opportunities_found = Counter('arbitragex_opportunities_total', 'Oportunidades encontradas',
+                                           ['strategy', 'symbol', 'buy_exchange', 'sell_exchange'],
+                                           registry=registry)
+        self.trade_duration_seconds = Histogram('arbitragex_trade_duration_seconds', 'Duração dos trades',
+                                                ['strategy'], registry=registry)
+        self.balance = Gauge('arbitragex_balance', 'Balance atual',
+                             ['strategy'], multiprocess_mode='liveall', registry=registry)
+
+        # Market data por exchange
+        self.quotes_total = Counter('arbitragex_quotes_total', 'Cotações recebidas',
+                                    ['symbol', 'exchange'], registry=registry)
+        self.fetch_errors_total = Counter('arbitragex_fetch_errors_total', 'Falhas ao buscar cotações',
+                                          ['symbol', 'exchange'], registry=registry)
+        self.fetch_latency = Histogram('arbitragex_fetch_latency_seconds', 'Latência das APIs das exchanges',
+                                       ['symbol', 'exchange'], buckets=FETCH_LATENCY_BUCKETS,
+                                       registry=registry)
+        self.quote_spread = Gauge('arbitragex_quote_spread_percent', 'Spread bid/ask por exchange',
+                                  ['symbol', 'exchange'], multiprocess_mode='livemax', registry=registry)
+        self.route_spread = Gauge('arbitragex_route_spread_percent', 'Spread entre exchanges por rota',
+                                  ['symbol', 'buy_exchange', 'sell_exchange'],
+                                  multiprocess_mode='livemax', registry=registry)
+
+        # Notificações (Telegram/Discord)
+        self.notification_queue_depth = Gauge('arbitragex_notification_queue_depth',
+                                              'Alertas aguardando envio por canal',
+                                              ['channel'], multiprocess_mode='livesum', registry=registry)
+        self.notification_send_latency = Histogram('arbitragex_notification_send_latency_seconds',
+                                                   'Latência de envio de notificações',
+                                                   ['channel'], buckets=NOTIFICATION_LATENCY_BUCKETS,
+                                                   registry=registry)
+        self.notifications_sent_total = Counter('arbitragex_notifications_sent_total',
+                                                'Mensagens enviadas por canal e resultado',
+                                                ['channel', 'status'], registry=registry)
+        self.notification_alerts_total = Counter('arbitragex_notification_alerts_total',
+                                                 'Alertas agrupados ou descartados antes do envio',
+                                                 ['channel', 'outcome'], registry=registry)
+
+        # Inicialização
+        self.startup_phase = Gauge('arbitragex_startup_phase_seconds', 'Duração das fases de inicialização',
+                                   ['phase'], multiprocess_mode='liveall', registry=registry)
+
+        self._venues: Dict[Tuple[str, str], VenueMetrics] = {}
+        self._channels: Dict[str, ChannelMetrics] = {}
+        self._strategies: Dict[str, StrategyMetrics] = {}
+
+    def bind(self, symbols: Iterable[str], exchanges: Iterable[str], strategy: Optional[str] = DEFAULT_STRATEGY):
+        """Pré-vincular filhos para todos os símbolos e exchanges conhecidos"""
+        symbols = [symbol.strip() for symbol in symbols]
+        exchanges = list(exchanges)
+        for symbol in symbols:
+            for exchange in exchanges:
+                self.venue(symbol, exchange)
+        if strategy is not None:
+            self.strategy(strategy).bind(symbols, exchanges)
+
+    def strategy(self, strategy: str) -> StrategyMetrics:
+        metrics = self._strategies.get(strategy)
+        if metrics is None:
+            metrics = self._strategies[strategy] = StrategyMetrics(self, strategy)
+        return metrics
+
+    def venue(self, symbol: str, exchange: str) -> VenueMetrics:
+        metrics = self._venues.get((symbol, exchange))
+        if metrics is None:
+            metrics = self._venues[(symbol, exchange)] = VenueMetrics(self, symbol, exchange)
+        return metrics
+
+    # Atalhos para a estratégia padrão (processo com um único bot); criados
+    # sob demanda para não exportar `strategy="default"` com várias estratégias
+    @property
+    def balance_gauge(self):
+        return self.strategy(DEFAULT_STRATEGY).balance_gauge
+
+    @property
+    def trade_duration(self):
+        return self.strategy(DEFAULT_STRATEGY).trade_duration
+
+    def route(self, symbol: str, buy_exchange: str, sell_exchange: str) -> RouteMetrics:
+        return self.strategy(DEFAULT_STRATEGY).route(symbol, buy_exchange, sell_exchange)
+
+    def symbol(self, symbol: str) -> SymbolMetrics:
+        return self.strategy(DEFAULT_STRATEGY).symbol(symbol)
+
+    def channel(self, channel: str) -> ChannelMetrics:
+        metrics = self._channels.get(channel)
+        if metrics is None:
+            metrics = self._channels[channel] = ChannelMetrics(self, channel)
+        return metrics
+
     async def start(self):
-        """Iniciar servidor de métricas"""
+        """Iniciar servidor de métricas (uma única vez por processo)"""
+        if self._server_started:
+            return
+        registry = self.registry
+        if self.multiprocess_dir:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
         try:
-            start_http_server(8000)
-            logger.info("✅ Servidor de métricas iniciado na porta 8000")
+            start_http_server(self.port, registry=registry)
+            self._server_started = True
+            mode = " (multiprocess)" if self.multiprocess_dir else ""
+            logger.info(f"✅ Servidor de métricas iniciado na porta {self.port}{mode}")
+        except OSError as e:
+            if "Address already in use" in str(e):
+                logger.info(f"📊 Servidor de métricas já está rodando na porta {self.port}")
+            else:
+                logger.error(f"❌ Erro ao iniciar métricas: {e}")
         except Exception as e:
             logger.error(f"❌ Erro ao iniciar métricas: {e}")
-    
-    async def record_trade(self, profit: float):
+
+    async def record_trade(self, symbol: str, profit: float):
         """Registrar trade executado"""
-        self.trades_total.inc()
-        self.profit_total.inc(profit)
+        metrics = self.symbol(symbol)
+        metrics.trades.inc()
+        metrics.profit.inc(profit)
         logger.debug(f"Métricas atualizadas - Profit: ${profit:.2f}")
-    
+
     async def stop(self):
         """Parar coletor de métricas"""
         logger.info("Parando coletor de métricas...")
+        if self.multiprocess_dir:
+            multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,335 @@
+"""
+Despacho de alertas para Telegram/Discord fora do loop de detecção
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Limite de taxa: `rate` mensagens/s com rajadas de até `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def delay(self) -> float:
+        """Segundos até haver um token disponível"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class NotificationChannel(ABC):
+    """Provedor de notificações: URL, payload e limites de envio"""
+    name = 'channel'
+    rate = 1.0
+    burst = 1
+    max_length = 2000
+
+    @abstractmethod
+    def request(self, text: str) -> Tuple[str, Dict]:
+        """URL e payload JSON da mensagem"""
+
+    def retry_after(self, data: Dict, headers) -> float:
+        return float(headers.get('Retry-After', 1.0))
+
+
+class TelegramChannel(NotificationChannel):
+    """Bot API do Telegram: ~1 mensagem/s por chat"""
+    name = 'telegram'
+    rate = 1.0
+    burst = 1
+    max_length = 4096
+
+    def __init__(self, token: str, chat_id: str, api_url: str = 'https://api.telegram.org'):
+        self.url = f"{api_url.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+
+    def request(self, text: str) -> Tuple[str, Dict]:
+        return self.url, {'chat_id': self.chat_id, 'text': text, 'disable_web_page_preview': True}
+
+    def retry_after(self, data: Dict, headers) -> float:
+        return float(data.get('parameters', {}).get('retry_after') or super().retry_after(data, headers))
+
+
+class DiscordChannel(NotificationChannel):
+    """Webhook do Discord: 30 mensagens/min, rajadas de 5"""
+    name = 'discord'
+    rate = 0.5
+    burst = 5
+    max_length = 2000
+
+    def __init__(self, webhook_url: str):
+        self.url = webhook_url
+
+    def request(self, text: str) -> Tuple[str, Dict]:
+        return self.url, {'content': text}
+
+    def retry_after(self, data: Dict, headers) -> float:
+        return float(data.get('retry_after') or super().retry_after(data, headers))
+
+
+class _Outbox:
+    """Alertas pendentes de um canal, agrupados por chave"""
+
+    def __init__(self, channel: NotificationChannel, metrics=None):
+        self.channel = channel
+        self.metrics = metrics
+        self.pending: 'OrderedDict[object, List]' = OrderedDict()
+        self.dropped = 0
+        self.bucket = TokenBucket(channel.rate, channel.burst)
+        self.blocked_until = 0.0
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        # contadores locais (também expostos no Prometheus quando há métricas)
+        self.sent = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    def _depth_changed(self):
+        if self.metrics:
+            self.metrics.queue_depth.set(len(self.pending))
+
+    def put(self, key, text: str, max_queue: int) -> bool:
+        item = self.pending.get(key)
+        if item is not None:
+            item[0] = text
+            item[1] += 1
+            self.coalesced += 1
+            if self.metrics:
+                self.metrics.coalesced.inc()
+            return True
+        if len(self.pending) >= max_queue:
+            self.dropped += 1
+            if self.metrics:
+                self.metrics.dropped.inc()
+            return False
+        self.pending[key] = [text, 1]
+        self._depth_changed()
+        self.ready.set()
+        return True
+
+    def take(self) -> Tuple[List[Tuple[object, List]], int]:
+        items, dropped = list(self.pending.items()), self.dropped
+        self.pending = OrderedDict()
+        self.dropped = 0
+        self.ready.clear()
+        self._depth_changed()
+        return items, dropped
+
+    def restore(self, items: List[Tuple[object, List]], dropped: int, max_queue: int):
+        """Devolver um digest recusado (429) à frente da fila"""
+        restored = OrderedDict(items)
+        for key, item in self.pending.items():
+            if key in restored:
+                restored[key][0] = item[0]
+                restored[key][1] += item[1]
+            elif len(restored) >= max_queue:
+                dropped += item[1]
+                if self.metrics:
+                    self.metrics.dropped.inc(item[1])
+            else:
+                restored[key] = item
+        self.pending = restored
+        self.dropped += dropped
+        self.ready.set()
+        self._depth_changed()
+
+
+def format_digest(items: List[List], dropped: int, max_length: int) -> str:
+    """Montar uma mensagem única com os alertas pendentes, dentro do limite do canal"""
+    def line(text, count):
+        return f"{text} (x{count})" if count > 1 else text
+
+    if len(items) == 1 and not dropped:
+        return line(*items[0])[:max_length]
+
+    footer = f"\n⚠️ {dropped} alertas descartados (fila cheia)" if dropped else ""
+    lines = [f"📣 ArbitrageX: {sum(count for _, count in items) + dropped} alertas"]
+    length = len(lines[0]) + len(footer)
+    for i, (text, count) in enumerate(items):
+        entry = line(text, count)
+        # reservar espaço para a linha de resumo
+        if length + len(entry) + 40 > max_length:
+            lines.append(f"… e mais {len(items) - i} alertas")
+            break
+        lines.append(entry)
+        length += len(entry) + 1
+    return "\n".join(lines) + footer
+
+
+class NotificationDispatcher:
+    """
+    Envia alertas em segundo plano sem bloquear detecção ou execução.
+
+    `notify()` é síncrono e só grava na fila limitada de cada canal. Alertas
+    com a mesma chave (ex.: a mesma rota) são agrupados. Cada canal tem uma
+    task que espera `digest_window` segundos após o primeiro alerta, respeita
+    o limite de taxa do provedor (e o `retry_after` de respostas 429) e envia
+    tudo o que estiver pendente como um único digest. Com a fila cheia, novos
+    alertas são descartados e contabilizados no próximo digest.
+    """
+
+    def __init__(self, channels: Iterable[NotificationChannel], max_queue: int = 1000,
+                 digest_window: float = 5.0, timeout: float = 10.0, metrics=None):
+        self.max_queue = max_queue
+        self.digest_window = digest_window
+        self.timeout = timeout
+        self.outboxes = [
+            _Outbox(channel, metrics.channel(channel.name) if metrics else None)
+            for channel in channels
+        ]
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._closing = asyncio.Event()
+
+    @classmethod
+    def from_config(cls, config, metrics=None) -> Optional['NotificationDispatcher']:
+        """Criar dispatcher com os canais configurados (None se nenhum)"""
+        channels = []
+        if config.telegram_bot_token and config.telegram_chat_id:
+            channels.append(TelegramChannel(config.telegram_bot_token, config.telegram_chat_id,
+                                            config.telegram_api_url))
+        if config.discord_webhook_url:
+            channels.append(DiscordChannel(config.discord_webhook_url))
+        if not channels:
+            return None
+        return cls(channels, max_queue=config.notify_queue_size,
+                   digest_window=config.notify_digest_seconds, metrics=metrics)
+
+    async def start(self):
+        self._closing.clear()
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        for outbox in self.outboxes:
+            outbox.task = asyncio.create_task(self._run(outbox))
+        logger.info(f"🔔 Notificações ativas: {', '.join(o.channel.name for o in self.outboxes)}")
+
+    async def stop(self, flush_timeout: float = 5.0):
+        """Enviar o que estiver pendente (até `flush_timeout`) e encerrar"""
+        self._closing.set()
+        for outbox in self.outboxes:
+            outbox.ready.set()
+        tasks = [outbox.task for outbox in self.outboxes if outbox.task]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=flush_timeout)
+            for task in pending:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        for outbox in self.outboxes:
+            outbox.task = None
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def notify(self, text: str, key=None) -> bool:
+        """Enfileirar alerta em todos os canais; nunca bloqueia"""
+        accepted = True
+        for outbox in self.outboxes:
+            accepted &= outbox.put(key if key is not None else object(), text, self.max_queue)
+        return accepted
+
+    def notify_opportunity(self, opportunity: Dict) -> bool:
+        return self.notify(
+            f"🎯 {opportunity['symbol']}: comprar em {opportunity['buy_exchange']} ${opportunity['buy_price']:.2f}, "
+            f"vender em {opportunity['sell_exchange']} ${opportunity['sell_price']:.2f} "
+            f"({opportunity['profit_percent']:.2f}%)",
+            key=('opportunity', opportunity['symbol'], opportunity['buy_exchange'], opportunity['sell_exchange'])
+        )
+
+    def notify_trade(self, opportunity: Dict, profit: float, balance: float) -> bool:
+        return self.notify(
+            f"✅ Trade {opportunity['symbol']} {opportunity['buy_exchange']} → {opportunity['sell_exchange']}: "
+            f"lucro ${profit:.2f}, balance ${balance:.2f}"
+        )
+
+    async def _sleep(self, seconds: float):
+        """Pausa interrompida pelo shutdown"""
+        try:
+            await asyncio.wait_for(self._closing.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self, outbox: _Outbox):
+        while True:
+            await outbox.ready.wait()
+            if not outbox.pending and not outbox.dropped:
+                if self._closing.is_set():
+                    return
+                outbox.ready.clear()
+                continue
+
+            # janela de agrupamento: deixar a rajada acumular
+            if not self._closing.is_set():
+                await self._sleep(self.digest_window)
+
+            while True:
+                wait = max(outbox.bucket.delay(), outbox.blocked_until - time.monotonic())
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            outbox.bucket.consume()
+
+            items, dropped = outbox.take()
+            await self._send(outbox, items, dropped)
+
+            # no shutdown, encerrar assim que não houver mais nada pendente
+            # (take() limpou `ready`, que não seria sinalizado de novo)
+            if self._closing.is_set() and not outbox.pending and not outbox.dropped:
+                return
+
+    async def _send(self, outbox: _Outbox, items: List[Tuple[object, List]], dropped: int):
+        channel = outbox.channel
+        url, payload = channel.request(format_digest([item for _, item in items], dropped, channel.max_length))
+        start = time.perf_counter()
+        status = None
+        retry_after = 1.0
+        try:
+            async with self.session.post(url, json=payload) as response:
+                status = response.status
+                if status == 429:
+                    try:
+                        data = await response.json(content_type=None)
+                    except Exception:
+                        data = {}
+                    retry_after = channel.retry_after(data if isinstance(data, dict) else {}, response.headers)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao enviar notificação ({channel.name}): {e}")
+        finally:
+            if outbox.metrics:
+                outbox.metrics.send_latency.observe(time.perf_counter() - start)
+
+        if status is not None and 200 <= status < 300:
+            outbox.sent += 1
+            if outbox.metrics:
+                outbox.metrics.sent.inc()
+        elif status == 429:
+            outbox.rate_limited += 1
+            outbox.blocked_until = time.monotonic() + retry_after
+            outbox.restore(items, dropped, self.max_queue)
+            if outbox.metrics:
+                outbox.metrics.rate_limited.inc()
+            logger.warning(f"⏳ {channel.name}: limite de taxa atingido, nova tentativa em {retry_after:.1f}s")
+        else:
+            outbox.failed += 1
+            if outbox.metrics:
+                outbox.metrics.failed.inc()
+            if status is not None:
+                logger.warning(f"⚠️ {channel.name} respondeu HTTP {status}; {len(items)} alertas descartados")
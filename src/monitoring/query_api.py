@@ -0,0 +1,116 @@
+"""
+API local de consulta do ArbitrageX - book atual, séries recentes e oportunidades
+"""
+
+import time
+import logging
+from typing import Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+MAX_SERIES_SECONDS = 24 * 3600
+
+
+class QueryAPI:
+    """
+    Servidor HTTP/JSON no próprio event loop do bot, lendo os ring buffers
+    de ticks e o cache de oportunidades em memória (sem consultar exchanges
+    ou banco).
+
+    GET /api/symbols
+    GET /api/book?symbol=BTC/USDT
+    GET /api/series?symbol=BTC/USDT[&exchange=binance][&seconds=300]
+    GET /api/opportunities
+    GET /api/strategies
+    """
+
+    def __init__(self, tick_store, opportunity_cache=None, port: int = 8002, strategies=None,
+                 host: str = '127.0.0.1'):
+        self.tick_store = tick_store
+        self.opportunity_cache = opportunity_cache
+        # bots (estratégias) cujo resultado é exposto em /api/strategies
+        self.strategies = strategies or []
+        self.port = port
+        self.host = host
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/api/symbols', self.handle_symbols)
+        self.app.router.add_get('/api/book', self.handle_book)
+        self.app.router.add_get('/api/series', self.handle_series)
+        self.app.router.add_get('/api/opportunities', self.handle_opportunities)
+        self.app.router.add_get('/api/strategies', self.handle_strategies)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, host=self.host, port=self.port).start()
+            logger.info(f"🔎 API de consulta em http://{self.host}:{self.port}/api")
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao iniciar API de consulta: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_symbols(self, request: web.Request) -> web.Response:
+        return web.json_response({'symbols': self.tick_store.symbols()})
+
+    async def handle_book(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        if not symbol:
+            return web.json_response({'error': 'symbol obrigatório'}, status=400)
+        return web.json_response({'symbol': symbol, 'book': self.tick_store.latest_book(symbol)})
+
+    async def handle_series(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        if not symbol:
+            return web.json_response({'error': 'symbol obrigatório'}, status=400)
+        try:
+            seconds = min(float(request.query.get('seconds', '300')), MAX_SERIES_SECONDS)
+        except ValueError:
+            return web.json_response({'error': 'seconds inválido'}, status=400)
+
+        series = self.tick_store.series(symbol, request.query.get('exchange'), seconds)
+        return web.json_response({
+            'symbol': symbol,
+            'seconds': seconds,
+            'series': {
+                exchange: {field: values.tolist() for field, values in window.items()}
+                for exchange, window in series.items()
+            }
+        })
+
+    async def handle_opportunities(self, request: web.Request) -> web.Response:
+        if self.opportunity_cache is None:
+            return web.json_response({'active': [], 'recent': []})
+        now_monotonic = time.monotonic()
+        now = time.time()
+
+        def serialize(record):
+            # registros usam time.monotonic(); converter para epoch
+            return {
+                'symbol': record.symbol,
+                'buy_exchange': record.buy_exchange,
+                'sell_exchange': record.sell_exchange,
+                'first_seen': now - (now_monotonic - record.first_seen),
+                'last_seen': now - (now_monotonic - record.last_seen),
+                'duration': record.duration,
+                'profit_percent': record.last_profit_percent,
+                'peak_profit_percent': record.peak_profit_percent,
+                'observations': record.observations,
+            }
+
+        return web.json_response({
+            'active': [serialize(r) for r in self.opportunity_cache.active.values()],
+            'recent': [serialize(r) for r in self.opportunity_cache.closed[-50:]],
+        })
+
+    async def handle_strategies(self, request: web.Request) -> web.Response:
+        return web.json_response({'strategies': [bot.summary() for bot in self.strategies]})
@@ -3,12 +3,39 @@ Configuração centralizada do ArbitrageX
 """
 
 import os
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
-from dotenv import load_dotenv
 
-# Carregar variáveis de ambiente
-load_dotenv()
+_env_loaded = False
+
+
+def load_environment(env_file: Optional[str] = None):
+    """Carregar variáveis do arquivo .env (sem sobrescrever o ambiente)"""
+    global _env_loaded
+    from dotenv import load_dotenv
+
+    if env_file and Path(env_file).exists():
+        load_dotenv(env_file)
+    else:
+        load_dotenv()
+    _env_loaded = True
+
+
+def _getenv(name: str, default: str) -> str:
+    # .env é lido no primeiro Config(), não na importação do módulo
+    if not _env_loaded:
+        load_environment()
+    return os.getenv(name, default)
+
+
+def _env(name: str, default: str, cast: Callable[[str], Any] = str):
+    """Campo lido do ambiente ao criar o Config"""
+    return field(default_factory=lambda: cast(_getenv(name, default)))
+
+
+def _env_bool(name: str, default: str):
+    return _env(name, default, lambda value: value.lower() == 'true')
 
 @dataclass
 class ExchangeConfig:
@@ -21,37 +48,82 @@ class ExchangeConfig:
 @dataclass
 class Config:
     # Trading
-    initial_balance: float = float(os.getenv('INITIAL_BALANCE', '10000'))
-    min_profit_percent: float = float(os.getenv('MIN_PROFIT_PERCENT', '0.3'))
-    max_trade_amount: float = float(os.getenv('MAX_TRADE_AMOUNT', '1000'))
+    initial_balance: float = _env('INITIAL_BALANCE', '10000', float)
+    min_profit_percent: float = _env('MIN_PROFIT_PERCENT', '0.3', float)
+    max_trade_amount: float = _env('MAX_TRADE_AMOUNT', '1000', float)
+    
+    # De-duplicação de oportunidades
+    opportunity_ttl_seconds: float = _env('OPPORTUNITY_TTL_SECONDS', '30', float)
+    opportunity_hysteresis_percent: float = _env('OPPORTUNITY_HYSTERESIS_PERCENT', '0.05', float)
     
     # Sistema
-    environment: str = os.getenv('ENVIRONMENT', 'development')
-    log_level: str = os.getenv('LOG_LEVEL', 'INFO')
+    environment: str = _env('ENVIRONMENT', 'development')
+    log_level: str = _env('LOG_LEVEL', 'INFO')
     
     # Database
-    database_url: str = (
-        f"postgresql://{os.getenv('POSTGRES_USER', 'arbitrage_user')}:"
-        f"{os.getenv('POSTGRES_PASSWORD', 'arbitrage_pass')}@"
-        f"{os.getenv('POSTGRES_HOST', 'localhost')}:"
-        f"{os.getenv('POSTGRES_PORT', '5432')}/"
-        f"{os.getenv('POSTGRES_DB', 'arbitrage_db')}"
-    )
+    database_url: str = field(default_factory=lambda: (
+        f"postgresql://{_getenv('POSTGRES_USER', 'arbitrage_user')}:"
+        f"{_getenv('POSTGRES_PASSWORD', 'arbitrage_pass')}@"
+        f"{_getenv('POSTGRES_HOST', 'localhost')}:"
+        f"{_getenv('POSTGRES_PORT', '5432')}/"
+        f"{_getenv('POSTGRES_DB', 'arbitrage_db')}"
+    ))
+    
+    # Persistência de séries temporais
+    price_retention_days: int = _env('PRICE_RETENTION_DAYS', '7', int)
+    tick_flush_interval: float = _env('TICK_FLUSH_INTERVAL', '1.0', float)
     
     # Redis
-    redis_url: str = f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/{os.getenv('REDIS_DB', '0')}"
+    redis_url: str = field(default_factory=lambda: (
+        f"redis://{_getenv('REDIS_HOST', 'localhost')}:{_getenv('REDIS_PORT', '6379')}/{_getenv('REDIS_DB', '0')}"
+    ))
+    
+    # Sinal de entrada: 'threshold' (spread >= min_profit_percent) ou 'zscore'
+    # (dislocação persistente segundo as estatísticas móveis de spread)
+    signal_mode: str = _env('SIGNAL_MODE', 'threshold')
+    spread_window: int = _env('SPREAD_WINDOW', '120', int)
+    spread_halflife: float = _env('SPREAD_HALFLIFE', '30', float)
+    signal_zscore: float = _env('SIGNAL_ZSCORE', '2.0', float)
+    signal_persistence: int = _env('SIGNAL_PERSISTENCE', '3', int)
+    signal_min_samples: int = _env('SIGNAL_MIN_SAMPLES', '30', int)
+    
+    # Várias estratégias no mesmo processo (JSON com parâmetros por estratégia)
+    strategies_file: str = _env('STRATEGIES_FILE', '')
+    
+    # Recarga de bot_config (fallback de polling quando LISTEN/NOTIFY falha)
+    config_poll_interval: float = _env('CONFIG_POLL_INTERVAL', '30', float)
     
     # Monitoramento
-    prometheus_port: int = int(os.getenv('PROMETHEUS_PORT', '8000'))
+    prometheus_port: int = _env('PROMETHEUS_PORT', '8000', int)
+    
+    # Metadados de exchanges (pares, endpoints) em cache local
+    venue_metadata_cache: str = _env('VENUE_METADATA_CACHE', 'data/venue_metadata.json')
+    venue_metadata_max_age_hours: float = _env('VENUE_METADATA_MAX_AGE_HOURS', '24', float)
+    
+    # Ticks recentes em memória e API local de consulta
+    tick_buffer_size: int = _env('TICK_BUFFER_SIZE', '4096', int)
+    query_api_enabled: bool = _env_bool('QUERY_API_ENABLED', 'true')
+    query_api_port: int = _env('QUERY_API_PORT', '8002', int)
+    # API sem autenticação: apenas local por padrão
+    query_api_host: str = _env('QUERY_API_HOST', '127.0.0.1')
+    
+    # Diagnóstico de runtime (lag do event loop, callbacks lentos, profiler)
+    diagnostics_enabled: bool = _env_bool('DIAGNOSTICS_ENABLED', 'false')
+    diagnostics_port: int = _env('DIAGNOSTICS_PORT', '8001', int)
+    diagnostics_host: str = _env('DIAGNOSTICS_HOST', '127.0.0.1')
+    slow_callback_ms: float = _env('SLOW_CALLBACK_MS', '100', float)
     
     # Notificações
-    telegram_bot_token: str = os.getenv('TELEGRAM_BOT_TOKEN', '')
-    telegram_chat_id: str = os.getenv('TELEGRAM_CHAT_ID', '')
-    discord_webhook_url: str = os.getenv('DISCORD_WEBHOOK_URL', '')
+    telegram_bot_token: str = _env('TELEGRAM_BOT_TOKEN', '')
+    telegram_chat_id: str = _env('TELEGRAM_CHAT_ID', '')
+    discord_webhook_url: str = _env('DISCORD_WEBHOOK_URL', '')
+    telegram_api_url: str = _env('TELEGRAM_API_URL', 'https://api.telegram.org')
+    notify_digest_seconds: float = _env('NOTIFY_DIGEST_SECONDS', '5', float)
+    notify_queue_size: int = _env('NOTIFY_QUEUE_SIZE', '1000', int)
     
     # Usar field(default_factory) para listas mutáveis
     trading_symbols: List[str] = field(
-        default_factory=lambda: os.getenv('TRADING_SYMBOLS', 'BTC/USDT,ETH/USDT').split(',')
+        default_factory=lambda: _getenv('TRADING_SYMBOLS', 'BTC/USDT,ETH/USDT').split(',')
     )
     
     # Exchanges como property para evitar problemas com dataclass
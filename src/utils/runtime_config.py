@@ -0,0 +1,189 @@
+"""
+Configuração de runtime do ArbitrageX - recarregada da tabela bot_config sem restart
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canal usado pelo trigger de bot_config (ver init.sql)
+CONFIG_CHANNEL = 'bot_config_changed'
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value in ('true', '1', 'yes', 'on'):
+        return True
+    if value in ('false', '0', 'no', 'off'):
+        return False
+    raise ValueError(f"booleano inválido: {value!r}")
+
+
+def _parse_symbols(value: str) -> Tuple[str, ...]:
+    symbols = tuple(s.strip() for s in value.split(',') if s.strip())
+    if not symbols:
+        raise ValueError("lista de símbolos vazia")
+    return symbols
+
+
+# chave em bot_config -> (atributo do snapshot, parser)
+_PARSERS: Dict[str, Tuple[str, Callable[[str], object]]] = {
+    'min_profit_percent': ('min_profit_percent', float),
+    'max_trade_amount': ('max_trade_amount', float),
+    'trading_enabled': ('trading_enabled', _parse_bool),
+    'paper_trading': ('paper_trading', _parse_bool),
+    'trading_symbols': ('trading_symbols', _parse_symbols),
+}
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """Snapshot imutável da configuração ajustável em runtime"""
+    min_profit_percent: float
+    max_trade_amount: float
+    trading_enabled: bool = True
+    paper_trading: bool = True
+    trading_symbols: Tuple[str, ...] = ('BTC/USDT', 'ETH/USDT')
+    version: int = 0
+
+    @classmethod
+    def from_config(cls, config) -> 'RuntimeConfig':
+        """Snapshot inicial a partir do Config (variáveis de ambiente)"""
+        return cls(
+            min_profit_percent=float(config.min_profit_percent),
+            max_trade_amount=float(config.max_trade_amount),
+            trading_symbols=tuple(s.strip() for s in config.trading_symbols if s.strip())
+        )
+
+    def with_values(self, values: Dict[str, Optional[str]], version: int) -> 'RuntimeConfig':
+        """Novo snapshot com os valores de bot_config aplicados sobre este"""
+        changes = {'version': version}
+        for key, raw in values.items():
+            if key not in _PARSERS or raw is None:
+                continue
+            attr, parser = _PARSERS[key]
+            try:
+                changes[attr] = parser(raw)
+            except ValueError as e:
+                logger.warning(f"⚠️ Valor inválido em bot_config para {key}: {e}")
+        return replace(self, **changes)
+
+
+class RuntimeConfigService:
+    """
+    Mantém o snapshot atual de bot_config em `self.snapshot`.
+
+    Leituras no hot path são simples acessos de atributo: o snapshot é
+    imutável e trocado por inteiro a cada recarga. Mudanças chegam via
+    LISTEN/NOTIFY e, como fallback, por polling de `updated_at`.
+    """
+
+    def __init__(self, config, db_manager=None, poll_interval: float = 30.0):
+        self.db_manager = db_manager
+        self.poll_interval = poll_interval
+        self._base = RuntimeConfig.from_config(config)
+        self.snapshot = self._base
+        # valores brutos da última leitura de bot_config (chave -> valor)
+        self.values: Dict[str, Optional[str]] = {}
+        self._listeners: List[Callable[[RuntimeConfig], None]] = []
+        self._marker = None
+        self._changed: Optional[asyncio.Event] = None
+        self._listen_conn = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable[[RuntimeConfig], None]):
+        """Registrar callback chamado a cada novo snapshot"""
+        self._listeners.append(callback)
+
+    async def start(self):
+        """Carregar bot_config e iniciar observação de mudanças"""
+        if not (self.db_manager and self.db_manager.connected):
+            logger.info("⚙️  bot_config indisponível, usando configuração do ambiente")
+            return
+
+        self._changed = asyncio.Event()
+        try:
+            await self.reload()
+        except Exception as e:
+            # ex.: tabela bot_config ausente; o watcher tenta de novo a cada poll_interval
+            logger.error(f"❌ Erro ao carregar bot_config, usando configuração do ambiente: {e}")
+
+        try:
+            self._listen_conn = await self.db_manager.acquire()
+            await self._listen_conn.add_listener(CONFIG_CHANNEL, self._on_notify)
+            logger.info(f"⚙️  Ouvindo mudanças de configuração em '{CONFIG_CHANNEL}'")
+        except Exception as e:
+            logger.warning(f"⚠️ LISTEN indisponível, usando apenas polling: {e}")
+            await self._release_listen_conn()
+
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._release_listen_conn()
+
+    async def reload(self) -> bool:
+        """Recarregar bot_config; retorna True se os valores mudaram"""
+        rows = await self.db_manager.fetch("SELECT key, value, updated_at FROM bot_config")
+        marker = (len(rows), max((row['updated_at'] for row in rows), default=None))
+        if marker == self._marker:
+            return False
+        self._marker = marker
+
+        values = {row['key']: row['value'] for row in rows}
+        if values == self.values:
+            return False
+
+        snapshot = self._base.with_values(values, version=self.snapshot.version + 1)
+        self.values = values
+        self.snapshot = snapshot
+        logger.info(f"⚙️  Configuração v{snapshot.version} carregada: "
+                    f"min_profit={snapshot.min_profit_percent}% "
+                    f"max_trade=${snapshot.max_trade_amount} "
+                    f"trading_enabled={snapshot.trading_enabled} "
+                    f"paper_trading={snapshot.paper_trading} "
+                    f"symbols={','.join(snapshot.trading_symbols)}")
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"❌ Erro ao aplicar configuração: {e}")
+        return True
+
+    def layered(self, base: RuntimeConfig) -> RuntimeConfig:
+        """Valores atuais de bot_config aplicados sobre outra base (ex.: a config de uma estratégia)"""
+        return base.with_values(self.values, version=self.snapshot.version)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._changed.set()
+
+    async def _watch(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao recarregar bot_config: {e}")
+
+    async def _release_listen_conn(self):
+        if self._listen_conn is None:
+            return
+        try:
+            await self._listen_conn.remove_listener(CONFIG_CHANNEL, self._on_notify)
+        except Exception:
+            pass
+        await self.db_manager.release(self._listen_conn)
+        self._listen_conn = None
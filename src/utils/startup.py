@@ -0,0 +1,56 @@
+"""
+Medição das fases de inicialização do ArbitrageX
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Duração de cada fase da inicialização, do início do processo até a
+    primeira cotação. Fases podem rodar em paralelo (ex.: conexões com as
+    exchanges durante a conexão com o banco), então a soma das fases pode
+    ser maior que o tempo total.
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        # monotonic é o mesmo relógio em todos os processos (ver benchmarks/bench_startup.py)
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.phases: Dict[str, float] = {}
+        self.first_quote: Optional[float] = None
+        self._metrics = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.monotonic() - start
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def mark_first_quote(self):
+        if self.first_quote is None:
+            self.first_quote = self.elapsed()
+            logger.info(f"⚡ Primeira cotação {self.first_quote:.3f}s após o início do processo")
+            if self._metrics is not None:
+                self._metrics.startup_phase.labels('first_quote').set(self.first_quote)
+
+    def report(self, metrics=None) -> Dict[str, float]:
+        """Logar o tempo por fase e exportar para o Prometheus"""
+        total = self.elapsed()
+        breakdown = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items())
+        logger.info(f"⏱️  Inicialização em {total:.3f}s: {breakdown}")
+        self._metrics = metrics
+        if metrics is not None:
+            for name, seconds in self.phases.items():
+                metrics.startup_phase.labels(name).set(seconds)
+            metrics.startup_phase.labels('total').set(total)
+        return dict(self.phases, total=total)